@@ -3,15 +3,25 @@ import logging
 import signal
 
 from smartmirrord.logging_config import setup_logging
-from smartmirrord.config import SCHEDULE_JSON, DISPLAY_POLICY_TIMEOUT
+from smartmirrord.config import (
+    SCHEDULE_JSON,
+    DISPLAY_POLICY_TIMEOUT,
+    IR_REALTIME,
+    IR_REALTIME_CPU,
+)
+from smartmirrord.realtime import reserve_cpu
+from smartmirrord.services.scheduler_service import SchedulerService
 from smartmirrord.services.power_service import PowerService
+from smartmirrord.services.power_history import PowerHistory
 from smartmirrord.services.ir_service import IRService
 from smartmirrord.services.display_availability_service import DisplayAvailabilityService
 from smartmirrord.services.motion_service import MotionService
+from smartmirrord.services.motion_sampler import AdaptiveMotionSampler
 from smartmirrord.services.display_policy_service import DisplayPolicyService
 from smartmirrord.web.routes import web_remote
 from smartmirrord.hardware.uart_transport import UartTransport
 from smartmirrord.services.uart_dispatcher import UartDispatcher
+from smartmirrord.services.uart_correlator import UartCorrelator
 from smartmirrord.services.videomute_service import VideoMuteService
 
 logger = logging.getLogger(__name__)
@@ -24,28 +34,37 @@ def wait_for_shutdown(stop_event: threading.Event) -> None:
 
 def initialize_services(schedule_json):
     # Core services
-    power_service = PowerService()
+    scheduler = SchedulerService()
+    power_service = PowerService(scheduler, PowerHistory())
     ir_service = IRService()
     uart = UartTransport()
     dispatcher = UartDispatcher(uart)
+    correlator = UartCorrelator(dispatcher, uart, scheduler)
     motion_service = MotionService()
 
     # Core policy services
-    videomute_service = VideoMuteService(dispatcher, uart, power_service)
-    display_availability_service = DisplayAvailabilityService(power_service, ir_service)
+    videomute_service = VideoMuteService(dispatcher, correlator, power_service)
+    display_availability_service = DisplayAvailabilityService(power_service, ir_service, scheduler)
     display_policy_service = DisplayPolicyService(
         videomute_service,
         motion_service,
         power_service,
         DISPLAY_POLICY_TIMEOUT,
         schedule_json,
+        scheduler,
+    )
+    motion_service.set_sampler(
+        AdaptiveMotionSampler(power_service, display_policy_service)
     )
 
+    # Started first and stopped last: every other service sets timers on it.
     return {
+        "scheduler": scheduler,
         "power_service": power_service,
         "ir_service": ir_service,
         "uart": uart,
         "dispatcher": dispatcher,
+        "correlator": correlator,
         "motion_service": motion_service,
         "videomute_service": videomute_service,
         "display_availability_service": display_availability_service,
@@ -60,7 +79,7 @@ def start_services(services):
 
 
 def stop_services(services):
-    for service in services.values():
+    for service in reversed(list(services.values())):
         logger.info(f"Stopping {service.__class__.__name__}")
         service.stop()
 
@@ -68,10 +87,19 @@ def stop_services(services):
 def main():
     setup_logging()
 
+    if IR_REALTIME:
+        # Before any thread starts, so every other thread inherits the mask.
+        reserve_cpu(IR_REALTIME_CPU)
+
     services = initialize_services(SCHEDULE_JSON)
     start_services(services)
 
     web_remote.config["IR_SERVICE"] = services["ir_service"]
+    web_remote.config["MOTION_SERVICE"] = services["motion_service"]
+    web_remote.config["POWER_HISTORY"] = services["power_service"].history
+    web_remote.config["UART"] = services["uart"]
+    web_remote.config["UART_DISPATCHER"] = services["dispatcher"]
+    web_remote.config["UART_CORRELATOR"] = services["correlator"]
     web_thread = threading.Thread(
         target=web_remote.run,
         kwargs=dict(
@@ -79,7 +107,8 @@ def main():
             port=5000,
             debug=False,
             use_reloader=False,
-            threaded=False,
+            # Requests only queue IR work, so handling them concurrently is safe.
+            threaded=True,
         ),
         daemon=True,
     )
@@ -97,8 +126,15 @@ def main():
         finally:
             stop_event.set()
 
+    def handle_dump_signal(signum=None, frame=None):
+        try:
+            services["uart"].dump_recording()
+        except OSError:
+            logger.exception("Failed to dump UART recording")
+
     signal.signal(signal.SIGTERM, handle_shutdown_signal)
     signal.signal(signal.SIGINT, handle_shutdown_signal)
+    signal.signal(signal.SIGUSR1, handle_dump_signal)
 
     logger.info("SmartMirror daemon running.")
 
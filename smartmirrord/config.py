@@ -32,6 +32,25 @@ def get_float_env(key, default):
         return default
 
 
+def get_str_list_env(key, default):
+    """Parse comma-separated string list environment variable."""
+    value = os.getenv(key)
+    if value is None or not value.strip():
+        return default
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def get_int_list_env(key, default):
+    """Parse comma-separated integer list environment variable."""
+    value = os.getenv(key)
+    if value is None or not value.strip():
+        return default
+    try:
+        return [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        return default
+
+
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_TO_CONSOLE = get_bool_env("LOG_TO_CONSOLE", True)
@@ -44,10 +63,48 @@ UART_DEBUG = get_bool_env("UART_DEBUG", False)
 # Hardware config
 GPIO_CHIP_PATH = os.getenv("GPIO_CHIP_PATH", "/dev/gpiochip0")
 GPIO_POWER_STATUS_PIN = get_int_env("GPIO_POWER_STATUS_PIN", 23)
+GPIO_POWER_DEBOUNCE_MS = get_int_env("GPIO_POWER_DEBOUNCE_MS", 200)
 GPIO_IR_INPUT_PIN = get_int_env("GPIO_IR_INPUT_PIN", 27)
 
+# Stabilized power transitions kept in memory and appended to this file
+POWER_HISTORY_SIZE = get_int_env("POWER_HISTORY_SIZE", 8192)
+POWER_HISTORY_PATH = os.getenv("POWER_HISTORY_PATH") or os.path.join(
+    os.path.dirname(LOG_FILE_PATH), "power_history.bin"
+)
+# Seconds between "still watching" checkpoints; time after the last one
+# before a restart counts as unobserved.
+POWER_HISTORY_CHECKPOINT_SEC = get_float_env("POWER_HISTORY_CHECKPOINT_SEC", 300.0)
+
+# IR transmission
+IR_SEND_REPEATS = get_int_env("IR_SEND_REPEATS", 5)
+IR_FRAME_GAP_MS = get_float_env("IR_FRAME_GAP_MS", 5.0)
+# Per-class overrides. Volume can opt in to one frame followed by full-frame
+# repeats on the 108 ms held-key cadence instead of the default burst.
+IR_POWER_REPEATS = get_int_env("IR_POWER_REPEATS", 5)
+IR_POWER_FRAME_GAP_MS = get_float_env("IR_POWER_FRAME_GAP_MS", 5.0)
+IR_VOLUME_REPEAT_FRAMES = get_int_env("IR_VOLUME_REPEAT_FRAMES", 0)
+IR_HOLD_MAX_SEC = get_float_env("IR_HOLD_MAX_SEC", 5.0)
+# Delay between keys of a sequence or macro, so menus can keep up
+IR_SEQUENCE_KEY_DELAY_MS = get_float_env("IR_SEQUENCE_KEY_DELAY_MS", 250.0)
+# JSON file of {"name": ["key", ...]} macros, merged over IR_MACROS
+IR_MACROS_PATH = os.getenv("IR_MACROS_PATH", "")
+IR_EDGE_TOLERANCE_US = get_int_env("IR_EDGE_TOLERANCE_US", 100)
+# "hybrid" sleeps through long pulses and spins only near the edge; "spin"
+# busy-waits every pulse. A margin of 0 is calibrated at startup.
+IR_WAIT_STRATEGY = os.getenv("IR_WAIT_STRATEGY", "hybrid")
+IR_SLEEP_THRESHOLD_US = get_int_env("IR_SLEEP_THRESHOLD_US", 2000)
+IR_SLEEP_MARGIN_US = get_int_env("IR_SLEEP_MARGIN_US", 0)
+# Run the IR worker at SCHED_FIFO on a core reserved from the rest of the
+# daemon. Needs CAP_SYS_NICE or LimitRTPRIO; falls back to normal priority.
+IR_REALTIME = get_bool_env("IR_REALTIME", False)
+IR_REALTIME_PRIORITY = get_int_env("IR_REALTIME_PRIORITY", 50)
+IR_REALTIME_CPU = get_int_env("IR_REALTIME_CPU", 3)
+IR_QUEUE_SIZE = get_int_env("IR_QUEUE_SIZE", 32)
+IR_JOB_HISTORY = get_int_env("IR_JOB_HISTORY", 100)
+
 CAMERA_WIDTH = get_int_env("CAMERA_WIDTH", 640)
 CAMERA_HEIGHT = get_int_env("CAMERA_HEIGHT", 480)
+CAMERA_LORES = get_bool_env("CAMERA_LORES", False)
 
 MOTION_WIDTH = get_int_env("MOTION_WIDTH", 320)
 MOTION_HEIGHT = get_int_env("MOTION_HEIGHT", 240)
@@ -55,6 +112,32 @@ MOTION_HEIGHT = get_int_env("MOTION_HEIGHT", 240)
 MOTION_THRESHOLD = get_int_env("MOTION_THRESHOLD", 150)
 MOTION_COOLDOWN_SEC = get_int_env("MOTION_COOLDOWN_SEC", 6)
 
+# "frame_diff" compares against the previous frame, "background" against a
+# running average of recent frames.
+MOTION_DETECTOR = os.getenv("MOTION_DETECTOR", "frame_diff")
+MOTION_BACKGROUND_ALPHA = get_float_env("MOTION_BACKGROUND_ALPHA", 0.05)
+
+# Zone grid over the motion frame; thresholds are per zone in row-major order
+# and default to MOTION_THRESHOLD for every zone.
+MOTION_ZONE_ROWS = get_int_env("MOTION_ZONE_ROWS", 1)
+MOTION_ZONE_COLS = get_int_env("MOTION_ZONE_COLS", 1)
+MOTION_ZONE_THRESHOLDS = get_int_list_env("MOTION_ZONE_THRESHOLDS", [])
+MOTION_IGNORE_ZONES = get_int_list_env("MOTION_IGNORE_ZONES", [])
+MOTION_MASK_PATH = os.getenv("MOTION_MASK_PATH", "")
+
+# Seconds between motion frames per sampling tier
+MOTION_INTERVAL_WAKE = get_float_env("MOTION_INTERVAL_WAKE", 0.05)
+MOTION_INTERVAL_HOLD = get_float_env("MOTION_INTERVAL_HOLD", 1.0)
+MOTION_INTERVAL_QUIET = get_float_env("MOTION_INTERVAL_QUIET", 5.0)
+
+# Stop the camera while the panel is off or in quiet hours, restarting it
+# this many seconds before quiet hours end.
+MOTION_SUSPEND_CAMERA = get_bool_env("MOTION_SUSPEND_CAMERA", True)
+MOTION_CAMERA_WARMUP_SEC = get_float_env("MOTION_CAMERA_WARMUP_SEC", 10.0)
+
+# Run capture and detection in a child process
+MOTION_PROCESS = get_bool_env("MOTION_PROCESS", False)
+
 UART_PORT = os.getenv("UART_PORT", "/dev/serial0")
 UART_BAUDRATE = get_int_env("UART_BAUDRATE", 115200)
 UART_PARITY = serial.PARITY_NONE
@@ -63,6 +146,20 @@ UART_BYTESIZE = serial.EIGHTBITS
 UART_TIMEOUT = .1
 UART_READ_CHUNK_SIZE = 1024
 UART_WRITE_EOL = '\n'
+# Longest partial line buffered before it is dropped as overflow
+UART_MAX_LINE_BYTES = get_int_env("UART_MAX_LINE_BYTES", 4096)
+# Lines buffered between the UART reader and dispatch, and what to drop when
+# full: "drop_oldest", or "drop_prefix" to drop lines starting with one of
+# UART_QUEUE_DROP_PREFIXES (log chatter) first.
+UART_QUEUE_SIZE = get_int_env("UART_QUEUE_SIZE", 1024)
+UART_QUEUE_POLICY = os.getenv("UART_QUEUE_POLICY", "drop_oldest")
+UART_QUEUE_DROP_PREFIXES = get_str_list_env("UART_QUEUE_DROP_PREFIXES", [])
+# In-memory ring of recent UART lines, dumped on SIGUSR1 or POST /uart/dump
+UART_RECORDER_SLOTS = get_int_env("UART_RECORDER_SLOTS", 16384)
+UART_RECORDER_SLOT_BYTES = get_int_env("UART_RECORDER_SLOT_BYTES", 120)
+UART_DUMP_DIR = os.getenv("UART_DUMP_DIR") or os.path.dirname(LOG_FILE_PATH)
+# Seconds to wait for the mainboard to acknowledge a command
+UART_ACK_TIMEOUT = get_float_env("UART_ACK_TIMEOUT", 8.0)
 
 # Policy level config
 SCHEDULE_JSON = {
@@ -71,4 +168,8 @@ SCHEDULE_JSON = {
     ]
 }
 
+IR_MACROS = {
+    "service_menu": ["mute", "1", "8", "2", "power"],
+}
+
 DISPLAY_POLICY_TIMEOUT = get_int_env("DISPLAY_POLICY_TIMEOUT", 15)
@@ -1,22 +1,35 @@
 from picamera2 import Picamera2
 from smartmirrord import config
+from .frame_sources import FrameSource
 import time
 
 
-class Camera:
-    def __init__(self):
+class Camera(FrameSource):
+    def __init__(self, lores: bool = config.CAMERA_LORES):
         self.picam2 = None
+        self.lores = lores
 
     def start(self):
         try:
             self.picam2 = Picamera2()
 
-            camera_config = self.picam2.create_video_configuration(
-                main={
-                    "size": (config.CAMERA_WIDTH, config.CAMERA_HEIGHT),
-                    "format": "RGB888",
-                }
-            )
+            main = {
+                "size": (config.CAMERA_WIDTH, config.CAMERA_HEIGHT),
+                "format": "RGB888",
+            }
+
+            if self.lores:
+                # Let the ISP downscale into a YUV420 stream at motion size so
+                # read_frame() can hand back the luma plane directly.
+                camera_config = self.picam2.create_video_configuration(
+                    main=main,
+                    lores={
+                        "size": (config.MOTION_WIDTH, config.MOTION_HEIGHT),
+                        "format": "YUV420",
+                    },
+                )
+            else:
+                camera_config = self.picam2.create_video_configuration(main=main)
 
             self.picam2.configure(camera_config)
             self.picam2.start()
@@ -32,15 +45,39 @@ class Camera:
             return None
 
         try:
-            frame = self.picam2.capture_array()
+            if self.lores:
+                frame = self.picam2.capture_array("lores")
+            else:
+                frame = self.picam2.capture_array()
         except Exception:
             return None
 
         if frame is None or frame.size == 0:
             return None
 
+        if self.lores:
+            # YUV420 is laid out as the full-size Y plane followed by the
+            # quarter-size U and V planes; rows may be padded to the stride.
+            return frame[:config.MOTION_HEIGHT, :config.MOTION_WIDTH]
+
         return frame
 
+    def pause(self):
+        # Stop streaming but keep the configured pipeline for a fast resume.
+        if self.picam2:
+            self.picam2.stop()
+
+    def resume(self):
+        if self.picam2 is None:
+            self.start()
+            return
+
+        try:
+            self.picam2.start()
+            time.sleep(0.2)
+        except Exception as e:
+            raise RuntimeError(f"Failed to resume Picamera2: {e}")
+
     def stop(self):
         if self.picam2:
             self.picam2.stop()
@@ -0,0 +1,38 @@
+import time
+from typing import List, Tuple
+
+from .ir_frames import Value
+
+
+class RecordingLineRequest:
+    """
+    Stand-in for a gpiod line request that records every write.
+
+    Each set_value() appends ``(perf_counter_ns, value)``, taken right after
+    the call like the real request's write returning, so the recorded
+    edges are what a logic analyzer on the pin would have seen apart from
+    the kernel's GPIO latency.
+    """
+
+    def __init__(self):
+        self.times: List[int] = []
+        self.values: List[Value] = []
+        self.released = False
+
+    def set_value(self, pin: int, value: Value) -> None:
+        self.times.append(time.perf_counter_ns())
+        self.values.append(value)
+
+    def release(self) -> None:
+        self.released = True
+
+    def clear(self) -> None:
+        self.times.clear()
+        self.values.clear()
+
+    def pulses(self) -> List[Tuple[int, float]]:
+        """Recorded writes as ``(level, duration_us)`` pulses, like generate_pulses()."""
+        return [
+            (1 if value == Value.ACTIVE else 0, (end - start) / 1000.0)
+            for value, start, end in zip(self.values, self.times, self.times[1:])
+        ]
@@ -0,0 +1,184 @@
+import os
+import glob
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Matches MotionService's default wake-tier frame interval.
+DEFAULT_FPS = 20.0
+
+
+class FrameSource:
+    """
+    Interface for anything MotionService can pull frames from.
+
+    read_frame() returns an RGB or single-channel uint8 frame, or None if no
+    frame is available right now. File-backed sources report is_exhausted()
+    once they have nothing left, and ``timestamp`` holds the source time in
+    seconds of the last frame returned (None for live sources).
+    """
+
+    timestamp: Optional[float] = None
+
+    def start(self):
+        pass
+
+    def read_frame(self) -> Optional[np.ndarray]:
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+    def pause(self):
+        """Stop producing frames but keep whatever resume() needs."""
+        self.stop()
+
+    def resume(self):
+        self.start()
+
+    def is_exhausted(self) -> bool:
+        return False
+
+
+class PngDirectorySource(FrameSource):
+    """Frames from a directory of PNGs, replayed in filename order."""
+
+    def __init__(self, path: str, fps: float = DEFAULT_FPS):
+        self.path = path
+        self.fps = fps
+        self._files = []
+        self._index = 0
+
+    def start(self):
+        self._files = sorted(glob.glob(os.path.join(self.path, "*.png")))
+        if not self._files:
+            raise RuntimeError(f"No PNG frames found in {self.path}")
+        self._index = 0
+
+    def read_frame(self):
+        while self._index < len(self._files):
+            index = self._index
+            self._index += 1
+
+            frame = cv2.imread(self._files[index], cv2.IMREAD_UNCHANGED)
+            if frame is None or frame.size == 0:
+                continue
+
+            # imread decodes to BGR(A); the pipeline expects camera-style RGB.
+            if frame.ndim == 3:
+                code = cv2.COLOR_BGRA2RGB if frame.shape[2] == 4 else cv2.COLOR_BGR2RGB
+                frame = cv2.cvtColor(frame, code)
+
+            self.timestamp = index / self.fps
+            return frame
+
+        return None
+
+    def is_exhausted(self) -> bool:
+        return self._index >= len(self._files)
+
+
+class NumpyFrameSource(FrameSource):
+    """
+    Frames from a stacked ``(N, H, W[, 3])`` uint8 array.
+
+    ``.npy`` files are memory-mapped so only the frames being read are paged
+    in. ``.npz`` archives use their ``frames`` array (or the first array) and
+    an optional ``timestamps`` array in seconds.
+    """
+
+    def __init__(self, path: str, fps: float = DEFAULT_FPS):
+        self.path = path
+        self.fps = fps
+        self._frames = None
+        self._timestamps = None
+        self._archive = None
+        self._index = 0
+
+    def start(self):
+        if self.path.endswith(".npz"):
+            self._archive = np.load(self.path)
+            key = "frames" if "frames" in self._archive.files else self._archive.files[0]
+            self._frames = self._archive[key]
+            if "timestamps" in self._archive.files:
+                self._timestamps = self._archive["timestamps"]
+        else:
+            self._frames = np.load(self.path, mmap_mode="r")
+
+        if self._frames.ndim not in (3, 4):
+            raise RuntimeError(
+                f"Expected a (N, H, W[, 3]) frame stack in {self.path}, "
+                f"got shape {self._frames.shape}"
+            )
+        self._index = 0
+
+    def read_frame(self):
+        if self._frames is None or self._index >= len(self._frames):
+            return None
+
+        index = self._index
+        self._index += 1
+
+        if self._timestamps is not None:
+            self.timestamp = float(self._timestamps[index])
+        else:
+            self.timestamp = index / self.fps
+
+        return self._frames[index]
+
+    def stop(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        self._frames = None
+        self._timestamps = None
+
+    def is_exhausted(self) -> bool:
+        return self._frames is None or self._index >= len(self._frames)
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file through cv2.VideoCapture."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._capture = None
+        self._exhausted = False
+
+    def start(self):
+        self._capture = cv2.VideoCapture(self.path)
+        if not self._capture.isOpened():
+            self._capture = None
+            raise RuntimeError(f"Failed to open video {self.path}")
+        self._exhausted = False
+
+    def read_frame(self):
+        if self._capture is None:
+            return None
+
+        ok, frame = self._capture.read()
+        if not ok:
+            self._exhausted = True
+            return None
+
+        self.timestamp = self._capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        # VideoCapture decodes to BGR; the pipeline expects camera-style RGB.
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def stop(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+    def is_exhausted(self) -> bool:
+        return self._exhausted or self._capture is None
+
+
+def open_frame_source(path: str, fps: float = DEFAULT_FPS) -> FrameSource:
+    """Pick a file-backed source from the path: directory, .npy/.npz or video."""
+    if os.path.isdir(path):
+        return PngDirectorySource(path, fps)
+    if path.endswith((".npy", ".npz")):
+        return NumpyFrameSource(path, fps)
+    return VideoFileSource(path)
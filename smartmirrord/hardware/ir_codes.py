@@ -45,3 +45,11 @@ CODES = {
     "forward": 0x12ED,
     "p": 0x7C83
 }
+
+# Commands whose repeat behaviour differs from the default. Power has to
+# land reliably; volume has to feel immediate and is often held.
+COMMAND_CLASSES = {
+    "power": "power",
+    "volup": "volume",
+    "voldown": "volume",
+}
@@ -1,41 +1,146 @@
 import time
-import gpiod
-from gpiod.line import Direction, Value
-from smartmirrord.config import GPIO_IR_INPUT_PIN, GPIO_CHIP_PATH
-from .ir_codes import CODES, SAMSUNG_PREFIX
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+from smartmirrord.config import (
+    GPIO_IR_INPUT_PIN,
+    GPIO_CHIP_PATH,
+    IR_SEND_REPEATS,
+    IR_FRAME_GAP_MS,
+    IR_POWER_REPEATS,
+    IR_POWER_FRAME_GAP_MS,
+    IR_VOLUME_REPEAT_FRAMES,
+    IR_EDGE_TOLERANCE_US,
+    IR_WAIT_STRATEGY,
+    IR_SLEEP_THRESHOLD_US,
+    IR_SLEEP_MARGIN_US,
+)
+from .ir_codes import CODES, COMMAND_CLASSES, SAMSUNG_PREFIX
+from .ir_frames import (
+    CompiledFrame,
+    FrameTiming,
+    TimingStats,
+    Value,
+    calibrate_sleep_margin,
+    us_to_seconds,
+)
 from .ir_timing import (
     LEADER_LOW, LEADER_HIGH,
     BIT_LOW, BIT_HIGH_0, BIT_HIGH_1,
-    STOP_LOW
+    STOP_LOW,
+    REPEAT_PERIOD,
 )
 
+logger = logging.getLogger(__name__)
+
+WAIT_SPIN = "spin"
+WAIT_HYBRID = "hybrid"
+
+DEFAULT_CLASS = "default"
 
-def us_to_seconds(us: int) -> float:
-    return us / 1_000_000.0
+
+class RepeatPolicy:
+    """
+    How a single command is put on the wire.
+
+    ``frames`` full frames are sent ``gap`` seconds apart, then
+    ``repeat_frames`` more, each REPEAT_PERIOD after the start of the frame
+    before it, the way a held Samsung remote key repeats.
+    """
+
+    __slots__ = ("frames", "gap", "repeat_frames")
+
+    def __init__(self, frames: int, gap_ms: float = 0.0, repeat_frames: int = 0):
+        if frames < 1:
+            raise ValueError("A repeat policy needs at least one full frame")
+        self.frames = frames
+        self.gap = gap_ms / 1000.0
+        self.repeat_frames = repeat_frames
 
 
 class IREmulator:
-    def __init__(self, pin: int = GPIO_IR_INPUT_PIN):
+    def __init__(
+        self,
+        pin: int = GPIO_IR_INPUT_PIN,
+        repeats: int = IR_SEND_REPEATS,
+        frame_gap_ms: float = IR_FRAME_GAP_MS,
+        wait_strategy: str = IR_WAIT_STRATEGY,
+        policies: Optional[Dict[str, RepeatPolicy]] = None,
+        line_request=None,
+    ):
+        """
+        ``line_request`` replaces the gpiod line request with any object
+        offering ``set_value(pin, value)`` and ``release()``, e.g. the
+        RecordingLineRequest used by the timing benchmark.
+        """
+        if wait_strategy not in (WAIT_SPIN, WAIT_HYBRID):
+            raise ValueError(f"Unknown IR wait strategy: {wait_strategy}")
+
         self.pin = pin
+        self.repeats = repeats
+        self.frame_gap = frame_gap_ms / 1000.0
+        self.wait_strategy = wait_strategy
+        self.sleep_margin = 0.0
+        self._sleep_threshold = None
         self._running = False
         self.request = None
+        self._line_request = line_request
+
+        if policies is None:
+            policies = {"power": RepeatPolicy(IR_POWER_REPEATS, IR_POWER_FRAME_GAP_MS)}
+            # Volume keeps the default full-frame bursts unless held-key
+            # repeats are asked for.
+            if IR_VOLUME_REPEAT_FRAMES > 0:
+                policies["volume"] = RepeatPolicy(1, repeat_frames=IR_VOLUME_REPEAT_FRAMES)
+        self.policies = {DEFAULT_CLASS: RepeatPolicy(repeats, frame_gap_ms), **policies}
+
+        self._frames = {}
+        self._repeat_period = us_to_seconds(REPEAT_PERIOD)
+
+        self._tolerance = us_to_seconds(IR_EDGE_TOLERANCE_US)
+        self.timing_stats = TimingStats()
 
     def start(self):
         if self._running:
             return
 
-        settings = gpiod.LineSettings()
-        settings.direction = Direction.OUTPUT
+        if self._line_request is not None:
+            self.request = self._line_request
+        else:
+            # Imported here so the emulator runs off-target with a fake request.
+            import gpiod
+            from gpiod.line import Direction
 
-        try:
-            self.request = gpiod.request_lines(
-                path=GPIO_CHIP_PATH,
-                config={self.pin: settings},
-                consumer="smartmirrord",
-                output_values={self.pin: Value.ACTIVE},
-            )
-        except Exception as e:
-            raise RuntimeError(f"Failed to request GPIO line {self.pin}: {e}") from e
+            settings = gpiod.LineSettings()
+            settings.direction = Direction.OUTPUT
+
+            try:
+                self.request = gpiod.request_lines(
+                    path=GPIO_CHIP_PATH,
+                    config={self.pin: settings},
+                    consumer="smartmirrord",
+                    output_values={self.pin: Value.ACTIVE},
+                )
+            except Exception as e:
+                raise RuntimeError(f"Failed to request GPIO line {self.pin}: {e}") from e
+
+        if self.wait_strategy == WAIT_HYBRID:
+            self._sleep_threshold = IR_SLEEP_THRESHOLD_US
+            if IR_SLEEP_MARGIN_US > 0:
+                self.sleep_margin = us_to_seconds(IR_SLEEP_MARGIN_US)
+            else:
+                # Leave at least half of the shortest slept pulse asleep.
+                self.sleep_margin = calibrate_sleep_margin(
+                    max_us=self._sleep_threshold // 2
+                )
+            logger.info("IR hybrid wait margin: %.0fus", self.sleep_margin * 1e6)
+
+        # Precompile every code so a send does no per-pulse work.
+        self._frames = {
+            command: self._compile(self.generate_pulses(value))
+            for command, value in CODES.items()
+        }
 
         self._running = True
 
@@ -64,29 +169,145 @@ class IREmulator:
         pulses.append((0, STOP_LOW))
         return pulses
 
+    def policy_for(self, command: str) -> RepeatPolicy:
+        command_class = COMMAND_CLASSES.get(command, DEFAULT_CLASS)
+        return self.policies.get(command_class, self.policies[DEFAULT_CLASS])
+
     def send_raw(self, pulses):
         if not self._running:
             raise RuntimeError("IREmulator is not running")
 
-        for level, duration in pulses:
-            self.request.set_value(self.pin, Value.ACTIVE if level else Value.INACTIVE)
+        self.send_frame(self._compile(pulses))
+
+    def _compile(self, pulses) -> CompiledFrame:
+        return CompiledFrame(pulses, self._sleep_threshold)
+
+    def send_frame(self, frame: CompiledFrame) -> FrameTiming:
+        if not self._running:
+            raise RuntimeError("IREmulator is not running")
+
+        set_value = self.request.set_value
+        pin = self.pin
+        clock = time.perf_counter
+        sleep = time.sleep
+        actuals = frame.actuals
+
+        set_value(pin, frame.first_value)
+        # Every deadline hangs off this one timestamp; filling them overlaps
+        # with the first (leader) pulse.
+        frame.arm(clock(), self.sleep_margin)
 
-            end = time.perf_counter() + us_to_seconds(duration)
-            while time.perf_counter() < end:
+        i = 0
+        for value, end, wake in zip(frame.next_values, frame.deadlines, frame.wakes):
+            if wake:
+                remaining = wake - clock()
+                if remaining > 0:
+                    sleep(remaining)
+            while clock() < end:
                 pass
+            set_value(pin, value)
+            actuals[i] = clock()
+            i += 1
 
-        self.request.set_value(self.pin, Value.ACTIVE)
+        timing = FrameTiming(frame, self._tolerance)
+        self.timing_stats.record(timing)
 
-    def send(self, command: str):
+        if timing.late_edges:
+            logger.warning(
+                "IR frame had %d late edges (max error %.0fus, overrun %.0fus)",
+                timing.late_edges,
+                timing.max_error * 1e6,
+                timing.overrun * 1e6,
+            )
+        else:
+            logger.debug(
+                "IR frame sent (max error %.0fus, mean %.0fus)",
+                timing.max_error * 1e6,
+                timing.mean_error * 1e6,
+            )
+
+        return timing
+
+    def _lookup(self, command: str) -> CompiledFrame:
         if not self._running:
             raise RuntimeError("IREmulator is not running")
 
-        command = command.lower()
-        if command not in CODES:
+        frame = self._frames.get(command.lower())
+        if frame is None:
             raise ValueError(f"Unknown IR command: {command}")
+        return frame
+
+    def send(self, command: str):
+        frame = self._lookup(command)
+        cpu_start = time.thread_time()
+        self._send_with_policy(frame, self.policy_for(command.lower()))
+        self.timing_stats.record_command(time.thread_time() - cpu_start)
+
+    def send_sequence(self, commands, inter_key_delay: float):
+        """Send several commands back to back; all are looked up before any is sent."""
+        frames = [self._lookup(command) for command in commands]
+        policies = [self.policy_for(command.lower()) for command in commands]
+
+        for i, (frame, policy) in enumerate(zip(frames, policies)):
+            if i:
+                time.sleep(inter_key_delay)
+            cpu_start = time.thread_time()
+            self._send_with_policy(frame, policy)
+            self.timing_stats.record_command(time.thread_time() - cpu_start)
+
+    def _send_with_policy(self, frame: CompiledFrame, policy: RepeatPolicy):
+        # Full-frame repeats cover any frame the receiver misses; check
+        # timing_stats before lowering a policy's frame count.
+        for i in range(policy.frames):
+            if i:
+                time.sleep(policy.gap)
+            started = time.perf_counter()
+            self.send_frame(frame)
+
+        for _ in range(policy.repeat_frames):
+            started = self._send_repeat_after(frame, started)
+
+    def hold(
+        self,
+        command: str,
+        released: threading.Event,
+        max_duration: float,
+        preempt: Optional[Callable[[], bool]] = None,
+    ) -> int:
+        """
+        Send the full frame every REPEAT_PERIOD until ``released`` is set,
+        ``preempt()`` returns True or ``max_duration`` seconds have passed.
+        Returns the number of repeats sent after the first frame.
+        """
+        frame = self._lookup(command)
+
+        started = time.perf_counter()
+        give_up = started + max_duration
+        self.send_frame(frame)
+
+        sent = 0
+        while True:
+            # Waiting on the event doubles as the inter-frame gap, so a
+            # release takes effect without sending another code.
+            next_start = started + self._repeat_period
+            if released.wait(max(0.0, next_start - time.perf_counter())):
+                break
+            if preempt is not None and preempt():
+                logger.info("IR hold on %s preempted", command)
+                break
+            if next_start >= give_up:
+                logger.warning("IR hold on %s hit %.1fs limit", command, max_duration)
+                break
+            started = self._send_repeat_after(frame, started)
+            sent += 1
+
+        return sent
 
-        pulses = self.generate_pulses(CODES[command])
-        # bit bang style sends here. Maybe a python timing issue, but this works for now.
-        for _ in range(5):
-            self.send_raw(pulses)
-            time.sleep(0.005)
+    def _send_repeat_after(self, frame: CompiledFrame, previous_start: float) -> float:
+        next_start = previous_start + self._repeat_period
+        remaining = next_start - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+        started = time.perf_counter()
+        self.send_frame(frame)
+        return started
@@ -0,0 +1,203 @@
+import logging
+import time
+from array import array
+from enum import Enum
+from typing import Optional
+
+try:
+    from gpiod.line import Value
+except ImportError:
+    # Off-target (benchmarks, tests) frames are only ever written to a
+    # RecordingLineRequest, so a stand-in with gpiod's levels will do.
+    class Value(Enum):
+        INACTIVE = 0
+        ACTIVE = 1
+
+logger = logging.getLogger(__name__)
+
+
+def us_to_seconds(us: int) -> float:
+    return us / 1_000_000.0
+
+
+class CompiledFrame:
+    """
+    A pulse train resolved ahead of time for transmission.
+
+    ``first_value`` is driven at the start of the frame; ``next_values[i]`` is
+    driven once pulse ``i`` ends, at ``start + offsets[i]`` (the last entry
+    returns the line to idle). Offsets are cumulative perf_counter seconds,
+    so every edge is scheduled from the same start timestamp and timing
+    errors don't accumulate across the frame. ``arm(start)`` fills the
+    reusable ``deadlines`` list so the send loop only compares clocks, and
+    the loop records when each edge actually landed in ``actuals``.
+
+    Pulses at least ``sleep_threshold_us`` long (the leader halves) also get
+    a ``wakes`` entry ``margin`` seconds before their deadline: the sender
+    sleeps until then, releasing the CPU and the GIL, and spins only for the
+    last stretch. Short pulses have a wake of 0 and are spun throughout.
+    """
+
+    __slots__ = (
+        "first_value",
+        "next_values",
+        "offsets",
+        "long_pulses",
+        "deadlines",
+        "wakes",
+        "actuals",
+    )
+
+    def __init__(self, pulses, sleep_threshold_us: Optional[int] = None):
+        levels = [Value.ACTIVE if level else Value.INACTIVE for level, _ in pulses]
+
+        self.first_value = levels[0]
+        self.next_values = tuple(levels[1:]) + (Value.ACTIVE,)
+
+        self.offsets = array("d")
+        elapsed = 0
+        for _, duration in pulses:
+            elapsed += duration
+            self.offsets.append(us_to_seconds(elapsed))
+
+        self.long_pulses = tuple(
+            sleep_threshold_us is not None and duration >= sleep_threshold_us
+            for _, duration in pulses
+        )
+
+        self.deadlines = [0.0] * len(self.offsets)
+        self.wakes = [0.0] * len(self.offsets)
+        self.actuals = [0.0] * len(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def duration(self) -> float:
+        return self.offsets[-1]
+
+    def arm(self, start: float, margin: float = 0.0) -> None:
+        deadlines = self.deadlines
+        wakes = self.wakes
+        for i, offset in enumerate(self.offsets):
+            deadline = start + offset
+            deadlines[i] = deadline
+            if self.long_pulses[i]:
+                wakes[i] = deadline - margin
+
+
+def calibrate_sleep_margin(
+    samples: int = 50,
+    sleep_us: int = 1000,
+    percentile: float = 0.95,
+    max_us: Optional[int] = None,
+) -> float:
+    """
+    Measure how far time.sleep() overshoots on this system.
+
+    Returns a margin in seconds: the ``percentile`` overshoot, padded by
+    half again plus 50us, so a sleep ending that far before a deadline
+    reliably wakes in time to spin up to it. A percentile rather than the
+    worst sample keeps one scheduling hiccup during calibration from
+    turning every sleep into a spin. The result is capped at ``max_us``.
+    """
+    request = us_to_seconds(sleep_us)
+    clock = time.perf_counter
+    overshoots = []
+
+    for _ in range(samples):
+        start = clock()
+        time.sleep(request)
+        overshoots.append(max(0.0, clock() - start - request))
+
+    overshoots.sort()
+    typical = overshoots[min(len(overshoots) - 1, int(len(overshoots) * percentile))]
+    margin = typical * 1.5 + us_to_seconds(50)
+
+    if max_us is not None and margin > us_to_seconds(max_us):
+        logger.warning(
+            "Calibrated IR sleep margin %.0fus exceeds %dus; clamping it "
+            "(sleep overshoot is high, check system load)",
+            margin * 1e6,
+            max_us,
+        )
+        margin = us_to_seconds(max_us)
+
+    return margin
+
+
+class FrameTiming:
+    """
+    Edge timing of one transmitted frame.
+
+    An edge's error is how long after its deadline the GPIO write returned.
+    ``overrun`` is how late the frame's final edge landed, i.e. how much the
+    whole frame was stretched; ``overran`` is set when that exceeds the
+    tolerance.
+    """
+
+    __slots__ = ("edges", "max_error", "mean_error", "late_edges", "overrun", "overran")
+
+    def __init__(self, frame: CompiledFrame, tolerance: float):
+        errors = [actual - deadline for actual, deadline in zip(frame.actuals, frame.deadlines)]
+
+        self.edges = len(errors)
+        self.max_error = max(errors)
+        self.mean_error = sum(errors) / self.edges
+        self.late_edges = sum(1 for error in errors if error > tolerance)
+        self.overrun = errors[-1]
+        self.overran = self.overrun > tolerance
+
+    def as_dict(self) -> dict:
+        return {
+            "edges": self.edges,
+            "max_error_us": round(self.max_error * 1e6, 1),
+            "mean_error_us": round(self.mean_error * 1e6, 1),
+            "late_edges": self.late_edges,
+            "overrun_us": round(self.overrun * 1e6, 1),
+        }
+
+
+class TimingStats:
+    """Running edge timing and CPU totals across transmitted frames."""
+
+    def __init__(self):
+        self.commands = 0
+        self._cpu_time = 0.0
+        self.frames = 0
+        self.late_frames = 0
+        self.overrun_frames = 0
+        self.worst_overrun = 0.0
+        self.worst_error = 0.0
+        self._error_sum = 0.0
+        self._edges = 0
+        self.last: Optional[FrameTiming] = None
+
+    def record(self, timing: FrameTiming) -> None:
+        self.frames += 1
+        if timing.late_edges:
+            self.late_frames += 1
+        if timing.overran:
+            self.overrun_frames += 1
+        self.worst_overrun = max(self.worst_overrun, timing.overrun)
+        self.worst_error = max(self.worst_error, timing.max_error)
+        self._error_sum += timing.mean_error * timing.edges
+        self._edges += timing.edges
+        self.last = timing
+
+    def record_command(self, cpu_time: float) -> None:
+        self.commands += 1
+        self._cpu_time += cpu_time
+
+    def as_dict(self) -> dict:
+        return {
+            "commands": self.commands,
+            "mean_cpu_ms": round(self._cpu_time / self.commands * 1e3, 2) if self.commands else 0.0,
+            "frames": self.frames,
+            "late_frames": self.late_frames,
+            "overrun_frames": self.overrun_frames,
+            "worst_overrun_us": round(self.worst_overrun * 1e6, 1),
+            "worst_error_us": round(self.worst_error * 1e6, 1),
+            "mean_error_us": round(self._error_sum / self._edges * 1e6, 1) if self._edges else 0.0,
+            "last_frame": self.last.as_dict() if self.last else None,
+        }
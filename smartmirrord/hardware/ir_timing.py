@@ -7,3 +7,7 @@ BIT_HIGH_0 = 560
 BIT_HIGH_1 = 1690
 
 STOP_LOW = 560
+
+# Samsung remotes have no short NEC repeat code: a held key re-sends the
+# full frame, one per REPEAT_PERIOD measured from the previous frame's start.
+REPEAT_PERIOD = 108000
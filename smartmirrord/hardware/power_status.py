@@ -1,41 +1,76 @@
 import gpiod
+import logging
+import os
+import select
 import threading
 import time
+from datetime import timedelta
 from typing import Callable, Optional
-from smartmirrord.config import GPIO_POWER_STATUS_PIN, GPIO_CHIP_PATH
+from smartmirrord.config import GPIO_POWER_STATUS_PIN, GPIO_CHIP_PATH, GPIO_POWER_DEBOUNCE_MS
+from gpiod import EdgeEvent
 from gpiod.line import Direction, Edge, Value
 
+logger = logging.getLogger(__name__)
+
 
 class PowerStatus:
     """
     Low-level hardware access for reading the TV's LED pin.
     Emits events when power state changes.
+
+    on_change(is_on, timestamp_ns) is called from a thread blocked in poll()
+    on the line request and a self-pipe, so it never wakes while the LED is
+    steady and close() returns at once. The state comes from each edge's
+    type and the time from its kernel CLOCK_MONOTONIC timestamp, comparable
+    with time.monotonic_ns().
+
+    Bounces are filtered by the kernel's debounce_period where libgpiod
+    supports it; otherwise edges closer than ``bouncetime_ms`` to the last
+    accepted one are held back in Python, and the latest of them is
+    delivered once the line has been quiet for ``bouncetime_ms``, so the
+    final level of a bounce is never lost.
     """
 
+    READ_ERROR_BACKOFF_MS = 1000
+
     def __init__(
             self,
             pin: int = GPIO_POWER_STATUS_PIN,
-            on_change: Optional[Callable[[bool], None]] = None,
-            bouncetime_ms: int = 200,
+            on_change: Optional[Callable[[bool, int], None]] = None,
+            bouncetime_ms: int = GPIO_POWER_DEBOUNCE_MS,
             chip_path: str = GPIO_CHIP_PATH,
     ):
         self.pin = pin
         self.on_change = on_change
-        self.bouncetime = bouncetime_ms / 1000.0
-        self._last_event = 0
-        self._stop_event = threading.Event()
+        self.bouncetime_ns = bouncetime_ms * 1_000_000
+        self._last_event_ns = 0
+        self._running = False
+
+        try:
+            settings = gpiod.LineSettings(
+                direction=Direction.INPUT,
+                edge_detection=Edge.BOTH,
+                debounce_period=timedelta(milliseconds=bouncetime_ms),
+            )
+            self.kernel_debounce = True
+        except TypeError:
+            settings = gpiod.LineSettings(direction=Direction.INPUT, edge_detection=Edge.BOTH)
+            self.kernel_debounce = False
+            logger.info("GPIO debounce_period unsupported; debouncing power LED in Python")
 
         try:
             self.request = gpiod.request_lines(
                 path=chip_path,
-                config={pin: gpiod.LineSettings(direction=Direction.INPUT, edge_detection=Edge.BOTH)},
+                config={pin: settings},
                 consumer="smartmirrord",
             )
         except Exception as e:
             raise RuntimeError(f"Failed to request GPIO line {pin}: {e}") from e
 
         if self.on_change:
-            self._thread = threading.Thread(target=self._event_loop, daemon=True)
+            self._wake_r, self._wake_w = os.pipe()
+            self._running = True
+            self._thread = threading.Thread(target=self._event_loop, name="power-status", daemon=True)
             self._thread.start()
 
     def read(self) -> bool:
@@ -46,17 +81,65 @@ class PowerStatus:
         return self.request.get_values()[0] == Value.INACTIVE
 
     def _event_loop(self):
-        while not self._stop_event.is_set():
-            if self.request.wait_edge_events(timeout=0.5):
-                for _ in self.request.read_edge_events():
-                    now = time.monotonic()
-                    if now - self._last_event >= self.bouncetime:
-                        self._last_event = now
-                        if self.on_change:
-                            self.on_change(self._read_power_state())
+        poller = select.poll()
+        poller.register(self.request.fd, select.POLLIN)
+        poller.register(self._wake_r, select.POLLIN)
+        wake_poller = select.poll()
+        wake_poller.register(self._wake_r, select.POLLIN)
+
+        # Latest edge dropped by the Python debounce, as (is_on, timestamp_ns).
+        held = None
+
+        while self._running:
+            timeout = None
+            if held is not None:
+                quiet_at = self._last_event_ns + self.bouncetime_ns
+                timeout = max(0, (quiet_at - time.monotonic_ns()) // 1_000_000 + 1)
+
+            ready = poller.poll(timeout)
+            if any(fd == self._wake_r for fd, _ in ready):
+                return
+
+            if not ready:
+                # The bounce settled on the held edge; it is the real level.
+                self._last_event_ns = held[1]
+                self._deliver(*held)
+                held = None
+                continue
+
+            try:
+                events = self.request.read_edge_events()
+            except Exception:
+                logger.exception("Failed to read power status edge events")
+                if wake_poller.poll(self.READ_ERROR_BACKOFF_MS):
+                    return
+                continue
+
+            for event in events:
+                timestamp = event.timestamp_ns
+                # The pin reads low while the panel is on.
+                is_on = event.event_type == EdgeEvent.Type.FALLING_EDGE
+
+                if not self.kernel_debounce:
+                    if timestamp - self._last_event_ns < self.bouncetime_ns:
+                        held = (is_on, timestamp)
+                        continue
+                    self._last_event_ns = timestamp
+                    held = None
+
+                self._deliver(is_on, timestamp)
+
+    def _deliver(self, is_on: bool, timestamp: int):
+        try:
+            self.on_change(is_on, timestamp)
+        except Exception:
+            logger.exception("Exception in power status on_change")
 
     def close(self):
-        self._stop_event.set()
-        if hasattr(self, "_thread"):
+        if self._running:
+            self._running = False
+            os.write(self._wake_w, b"\0")
             self._thread.join(timeout=2.0)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
         self.request.release()
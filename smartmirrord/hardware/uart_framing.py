@@ -0,0 +1,89 @@
+from typing import Callable, List, Optional
+
+
+class LineFramer:
+    """
+    Splits a UART byte stream into decoded text lines.
+
+    Incoming chunks accumulate in one bytearray. Per chunk, the last newline
+    is found with ``rfind`` and everything before it is decoded straight out
+    of a memoryview and split in one go, so the work is linear in the bytes
+    received however many lines a burst holds; only the partial tail is
+    kept, still as bytes.
+
+    A partial line that grows past ``max_bytes`` without a newline (a stuck
+    or binary stream) is dropped up to its next newline and counted in
+    ``overflows``/``overflow_bytes`` instead of growing the buffer without
+    bound.
+
+    ``raw``, if given to feed(), sees every line's bytes before decoding or
+    stripping, blank ones included, as ``raw(data, dropped)``; pieces of an
+    over-long line are passed with ``dropped`` set as they are discarded.
+    """
+
+    def __init__(self, max_bytes: int, encoding: str = "utf-8"):
+        self.max_bytes = max_bytes
+        self.encoding = encoding
+
+        self._buffer = bytearray()
+        self._discarding = False
+
+        self.lines = 0
+        self.overflows = 0
+        self.overflow_bytes = 0
+
+    def feed(
+        self, data: bytes, raw: Optional[Callable[[bytes, bool], None]] = None
+    ) -> List[str]:
+        """Add a chunk and return the stripped, non-empty lines it completed."""
+        buffer = self._buffer
+        buffer += data
+
+        end = buffer.rfind(b"\n")
+        if end < 0:
+            lines = []
+        else:
+            if raw is not None:
+                for i, chunk in enumerate(bytes(buffer[:end]).split(b"\n")):
+                    raw(chunk, i == 0 and self._discarding)
+
+            # Decode every complete line in one pass and split in C; the
+            # partial tail stays in the buffer as bytes.
+            with memoryview(buffer) as view:
+                parts = str(view[:end], self.encoding, "ignore").split("\n")
+            del buffer[:end + 1]
+
+            if self._discarding:
+                # Tail of an oversized line; its head is already counted.
+                self.overflow_bytes += len(parts[0].encode(self.encoding)) + 1
+                parts[0] = ""
+                self._discarding = False
+
+            lines = [line for line in map(str.strip, parts) if line]
+
+        if len(buffer) > self.max_bytes:
+            if raw is not None:
+                raw(bytes(buffer), True)
+            if not self._discarding:
+                self.overflows += 1
+            self.overflow_bytes += len(buffer)
+            self._discarding = True
+            buffer.clear()
+
+        self.lines += len(lines)
+        return lines
+
+    def reset(self) -> None:
+        self._buffer.clear()
+        self._discarding = False
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def stats(self) -> dict:
+        return {
+            "lines": self.lines,
+            "buffered_bytes": len(self._buffer),
+            "overflows": self.overflows,
+            "overflow_bytes": self.overflow_bytes,
+        }
@@ -0,0 +1,98 @@
+import itertools
+import threading
+from collections import deque
+from typing import Iterable, Optional
+
+DROP_OLDEST = "drop_oldest"
+DROP_PREFIX = "drop_prefix"
+
+
+class LineQueue:
+    """
+    Bounded hand-off of received lines from the UART reader to dispatch.
+
+    put() never blocks, so a slow listener can't hold up the reader. When
+    the queue is full a line is dropped according to ``policy``:
+
+    - ``drop_oldest``: the oldest queued line goes.
+    - ``drop_prefix``: lines starting with one of ``drop_prefixes`` (log
+      chatter) are sacrificed first, oldest first, including the incoming
+      one; other lines are only dropped when nothing droppable is queued.
+
+    Droppable lines sit in their own deque, and get() takes whichever head
+    arrived first, so lines are still delivered in arrival order.
+    """
+
+    def __init__(self, maxsize: int, policy: str = DROP_OLDEST, drop_prefixes: Iterable[str] = ()):
+        if policy not in (DROP_OLDEST, DROP_PREFIX):
+            raise ValueError(f"Unknown UART queue policy: {policy}")
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self._drop_prefixes = tuple(drop_prefixes) if policy == DROP_PREFIX else ()
+
+        self._lines = deque()
+        self._low = deque()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.high_water = 0
+        self.dropped = 0
+        self.dropped_low = 0
+
+    def __len__(self) -> int:
+        return len(self._lines) + len(self._low)
+
+    def put(self, line: str) -> None:
+        low = bool(self._drop_prefixes) and line.startswith(self._drop_prefixes)
+
+        with self._cond:
+            if len(self) >= self.maxsize:
+                self.dropped += 1
+                if self._low:
+                    self._low.popleft()
+                    self.dropped_low += 1
+                elif low:
+                    self.dropped_low += 1
+                    return
+                else:
+                    self._lines.popleft()
+
+            (self._low if low else self._lines).append((next(self._seq), line))
+            self.high_water = max(self.high_water, len(self))
+            self._cond.notify()
+
+    def get(self) -> Optional[str]:
+        """Block for the next line; returns None once the queue is closed."""
+        with self._cond:
+            while not self._lines and not self._low and not self._closed:
+                self._cond.wait()
+
+            if self._closed:
+                return None
+
+            if not self._low or (self._lines and self._lines[0][0] < self._low[0][0]):
+                return self._lines.popleft()[1]
+            return self._low.popleft()[1]
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._lines.clear()
+            self._low.clear()
+            self._cond.notify_all()
+
+    def reset(self) -> None:
+        with self._cond:
+            self._closed = False
+            self._lines.clear()
+            self._low.clear()
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self),
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+            "dropped_low_priority": self.dropped_low,
+        }
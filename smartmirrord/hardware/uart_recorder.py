@@ -0,0 +1,110 @@
+import struct
+import threading
+import time
+from typing import Iterator, Tuple
+
+RX = 0
+TX = 1
+# Received bytes the framer discarded as part of an over-long line.
+RX_DROPPED = 2
+
+# Record: monotonic timestamp, direction, stored length, original length.
+_RECORD = struct.Struct("<dBHH")
+# File header: magic, version, slot bytes, record count, wall - monotonic offset.
+_HEADER = struct.Struct("<4sHHId")
+_MAGIC = b"SMUR"
+_VERSION = 1
+
+
+class UartRecorder:
+    """
+    Always-on ring of the most recent UART lines in both directions.
+
+    Every line is packed with ``struct.pack_into`` into the next fixed-size
+    slot of one preallocated bytearray: a monotonic timestamp, the
+    direction, and up to ``slot_bytes`` of the line (longer lines keep their
+    original length so truncation is visible). Received lines are recorded
+    as the raw bytes off the wire, so invalid UTF-8, blank lines and
+    dropped over-long lines all show up in a dump. Recording allocates
+    nothing beyond encoding a sent line, and the oldest records are
+    overwritten once the ring wraps.
+
+    Recording takes a lock shared with dump(), which copies the ring in one
+    step, so a dump never contains a slot that was being overwritten.
+    dump() writes the ring oldest-first to a file read_recording() can
+    decode.
+    """
+
+    def __init__(self, slots: int, slot_bytes: int):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._record_size = _RECORD.size + slot_bytes
+        self._buffer = bytearray(slots * self._record_size)
+        self._lock = threading.Lock()
+        self._written = 0
+
+    def record(self, direction: int, line: str) -> None:
+        self.record_bytes(direction, line.encode("utf-8", "replace"))
+
+    def record_raw(self, data: bytes, dropped: bool) -> None:
+        """LineFramer ``raw`` callback: record a received line as is."""
+        self.record_bytes(RX_DROPPED if dropped else RX, data)
+
+    def record_bytes(self, direction: int, data: bytes) -> None:
+        stored = data[:self.slot_bytes]
+
+        with self._lock:
+            index = self._written
+            offset = (index % self.slots) * self._record_size
+
+            _RECORD.pack_into(
+                self._buffer, offset, time.monotonic(), direction, len(stored), min(len(data), 0xFFFF)
+            )
+            start = offset + _RECORD.size
+            self._buffer[start:start + len(stored)] = stored
+            self._written = index + 1
+
+    def __len__(self) -> int:
+        return min(self._written, self.slots)
+
+    def dump(self, path: str) -> int:
+        """Write the ring to ``path`` oldest record first; returns the count."""
+        with self._lock:
+            written = self._written
+            snapshot = bytes(self._buffer)
+        count = min(written, self.slots)
+        first = written - count
+        size = self._record_size
+
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.slot_bytes, count, time.time() - time.monotonic()))
+            for index in range(first, written):
+                offset = (index % self.slots) * size
+                f.write(snapshot[offset:offset + size])
+
+        return count
+
+
+def read_recording(path: str) -> Tuple[float, Iterator[Tuple[float, int, bytes, bool]]]:
+    """
+    Open a dump written by UartRecorder.dump().
+
+    Returns the offset that turns record timestamps into wall-clock time and
+    an iterator of ``(timestamp, direction, data, truncated)`` records.
+    """
+    with open(path, "rb") as f:
+        magic, version, slot_bytes, count, wall_offset = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a UART recording")
+        body = f.read()
+
+    size = _RECORD.size + slot_bytes
+
+    def records():
+        for i in range(count):
+            offset = i * size
+            timestamp, direction, stored, original = _RECORD.unpack_from(body, offset)
+            start = offset + _RECORD.size
+            yield timestamp, direction, body[start:start + stored], original > stored
+
+    return wall_offset, records()
@@ -1,5 +1,10 @@
+import os
+import select
 import threading
 import logging
+import time
+from typing import Optional, Tuple
+
 import serial
 
 from smartmirrord.config import (
@@ -11,39 +16,87 @@ from smartmirrord.config import (
     UART_TIMEOUT,
     UART_READ_CHUNK_SIZE,
     UART_WRITE_EOL,
+    UART_MAX_LINE_BYTES,
+    UART_QUEUE_SIZE,
+    UART_QUEUE_POLICY,
+    UART_QUEUE_DROP_PREFIXES,
+    UART_RECORDER_SLOTS,
+    UART_RECORDER_SLOT_BYTES,
+    UART_DUMP_DIR,
 )
+from .uart_framing import LineFramer
+from .uart_queue import LineQueue
+from .uart_recorder import UartRecorder, TX
 
 logger = logging.getLogger(__name__)
 
 
 class UartTransport:
-    def __init__(self):
+    """
+    Line-oriented serial link to the mainboard.
+
+    Where the port has a pollable file descriptor the reader thread blocks in
+    poll() on it together with a self-pipe, so it sleeps until bytes arrive
+    or stop() writes to the pipe, then drains everything waiting in one
+    read. Otherwise it falls back to reads with a UART_TIMEOUT timeout.
+
+    Listeners run on a separate ``uart-dispatch`` thread fed through a
+    bounded LineQueue, so a slow listener drops lines by the configured
+    policy instead of stalling reads and overflowing the kernel buffer.
+    """
+
+    def __init__(self, port: str = UART_PORT, baudrate: int = UART_BAUDRATE):
+        self.port = port
+        self.baudrate = baudrate
         self._serial = None
+        # _running ends with the reader thread; _started lasts until stop()
+        # has released the port, pipe and threads.
+        self._started = False
         self._running = False
         self._thread = None
+        self._dispatch_thread = None
+        self._wake_r = None
+        self._wake_w = None
+
+        self.reads = 0
+        self.idle_wakeups = 0
+        self._dropping = False
 
         self._listeners = []
         self._write_lock = threading.Lock()
 
-        self._rx_buffer = ""
+        self._framer = LineFramer(UART_MAX_LINE_BYTES)
+        self._queue = LineQueue(UART_QUEUE_SIZE, UART_QUEUE_POLICY, UART_QUEUE_DROP_PREFIXES)
+        self.recorder = UartRecorder(UART_RECORDER_SLOTS, UART_RECORDER_SLOT_BYTES)
 
     def start(self) -> None:
         """Open UART and start reader thread."""
-        if self._running:
+        if self._started:
             return
 
-        logger.info("Starting UART transport on %s", UART_PORT)
+        logger.info("Starting UART transport on %s", self.port)
 
         self._serial = serial.Serial(
-            port=UART_PORT,
-            baudrate=UART_BAUDRATE,
+            port=self.port,
+            baudrate=self.baudrate,
             parity=UART_PARITY,
             stopbits=UART_STOPBITS,
             bytesize=UART_BYTESIZE,
             timeout=UART_TIMEOUT,
         )
 
+        self._framer.reset()
+        self._queue.reset()
+        self._wake_r, self._wake_w = os.pipe()
+
+        self._started = True
         self._running = True
+        self._dispatch_thread = threading.Thread(
+            target=self._dispatch_loop,
+            name="uart-dispatch",
+            daemon=True,
+        )
+        self._dispatch_thread.start()
         self._thread = threading.Thread(
             target=self._read_loop,
             name="uart-reader",
@@ -52,17 +105,30 @@ class UartTransport:
         self._thread.start()
 
     def stop(self) -> None:
-        if not self._running:
+        # Checks _started, not _running: a reader that died on an error has
+        # already cleared _running but still leaves everything to release.
+        if not self._started:
             return
 
         logger.info("Stopping UART transport")
 
+        self._started = False
         self._running = False
+        os.write(self._wake_w, b"\0")
 
         if self._thread:
             self._thread.join(timeout=1.0)
             self._thread = None
 
+        self._queue.close()
+        if self._dispatch_thread:
+            self._dispatch_thread.join(timeout=1.0)
+            self._dispatch_thread = None
+
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+        self._wake_r = self._wake_w = None
+
         if self._serial:
             try:
                 self._serial.close()
@@ -79,46 +145,105 @@ class UartTransport:
 
         with self._write_lock:
             logger.debug("UART TX: %s", command)
+            self.recorder.record(TX, command)
             self._serial.write(data)
 
+    def dump_recording(self, path: Optional[str] = None) -> Tuple[str, int]:
+        """Write the recent-traffic ring to a file; returns (path, records)."""
+        if path is None:
+            name = time.strftime("uart-%Y%m%d-%H%M%S.bin")
+            path = os.path.join(UART_DUMP_DIR, name)
+        count = self.recorder.dump(path)
+        logger.info("Dumped %d UART records to %s", count, path)
+        return path, count
+
     def register_listener(self, callback) -> None:
         self._listeners.append(callback)
 
+    def stats(self) -> dict:
+        stats = self._framer.stats()
+        stats.update(reads=self.reads, idle_wakeups=self.idle_wakeups)
+        stats["queue"] = self._queue.stats()
+        return stats
+
     def _read_loop(self) -> None:
         logger.debug("UART reader thread started")
 
         try:
-            while self._running:
-                try:
-                    data = self._serial.read(UART_READ_CHUNK_SIZE)
-                except serial.SerialException:
-                    logger.exception("UART read error")
-                    break
+            fd = self._serial.fileno()
+            poll = select.poll
+        except (AttributeError, OSError, NotImplementedError):
+            fd = None
 
-                if not data:
-                    continue
+        try:
+            if fd is None:
+                logger.info("UART port not pollable; using %.1fs read timeout", UART_TIMEOUT)
+                self._timeout_loop()
+            else:
+                self._poll_loop(poll(), fd)
+        finally:
+            logger.debug("UART reader thread exiting")
+            self._running = False
 
-                try:
-                    text = data.decode("utf-8", errors="ignore")
-                except Exception:
-                    logger.exception("UART decode error")
-                    continue
+    def _poll_loop(self, poller, fd: int) -> None:
+        poller.register(fd, select.POLLIN | select.POLLPRI)
+        poller.register(self._wake_r, select.POLLIN)
 
-                self._rx_buffer += text
+        while self._running:
+            for ready, events in poller.poll():
+                if ready == self._wake_r:
+                    return
+                if events & (select.POLLERR | select.POLLHUP | select.POLLNVAL):
+                    logger.error("UART port closed or failed (poll events 0x%x)", events)
+                    return
 
-                while "\n" in self._rx_buffer:
-                    line, self._rx_buffer = self._rx_buffer.split("\n", 1)
-                    line = line.strip()
+            try:
+                data = self._serial.read(self._serial.in_waiting or 1)
+            except serial.SerialException:
+                logger.exception("UART read error")
+                return
 
-                    if not line:
-                        continue
+            self._on_data(data)
 
-                    logger.debug("UART RX: %s", line)
-                    self._dispatch_line(line)
+    def _timeout_loop(self) -> None:
+        while self._running:
+            try:
+                data = self._serial.read(UART_READ_CHUNK_SIZE)
+            except serial.SerialException:
+                logger.exception("UART read error")
+                return
 
-        finally:
-            logger.debug("UART reader thread exiting")
-            self._running = False
+            self._on_data(data)
+
+    def _on_data(self, data: bytes) -> None:
+        if not data:
+            self.idle_wakeups += 1
+            return
+
+        self.reads += 1
+        overflows = self._framer.overflows
+        dropped = self._queue.dropped
+        for line in self._framer.feed(data, self.recorder.record_raw):
+            logger.debug("UART RX: %s", line)
+            self._queue.put(line)
+
+        if self._framer.overflows != overflows:
+            logger.warning(
+                "UART line exceeded %d bytes; dropping it", UART_MAX_LINE_BYTES
+            )
+        if self._queue.dropped != dropped and not self._dropping:
+            self._dropping = True
+            logger.warning("UART dispatch queue full; dropping lines (%s)", self._queue.policy)
+        elif self._dropping and len(self._queue) < self._queue.maxsize // 2:
+            self._dropping = False
+            logger.warning("UART dispatch caught up; %d lines dropped so far", self._queue.dropped)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            line = self._queue.get()
+            if line is None:
+                return
+            self._dispatch_line(line)
 
     def _dispatch_line(self, line: str) -> None:
         for listener in self._listeners:
@@ -10,7 +10,7 @@ from smartmirrord.config import (
 )
 
 
-def setup_logging():
+def setup_logging(log_to_file: bool = LOG_TO_FILE):
     root = logging.getLogger()
     root.setLevel(LOG_LEVEL)
 
@@ -23,7 +23,7 @@ def setup_logging():
         console.setFormatter(formatter)
         root.addHandler(console)
 
-    if LOG_TO_FILE:
+    if log_to_file:
         file_handler = RotatingFileHandler(
             LOG_FILE_PATH,
             maxBytes=5 * 1024 * 1024,  # 5MB
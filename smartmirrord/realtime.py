@@ -0,0 +1,66 @@
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# CPU taken out of the daemon's affinity mask by reserve_cpu(), if any.
+_reserved_cpu: Optional[int] = None
+
+
+def reserve_cpu(cpu: int) -> bool:
+    """
+    Take ``cpu`` out of the calling thread's affinity mask.
+
+    Threads and child processes inherit the mask of the thread that creates
+    them, so calling this from the main thread before any service starts
+    keeps the whole daemon off the core, leaving it to whichever thread
+    later pins itself there with enter_realtime().
+    """
+    global _reserved_cpu
+
+    try:
+        allowed = os.sched_getaffinity(0)
+    except (AttributeError, OSError) as e:
+        logger.warning("Cannot read CPU affinity, not reserving CPU %d: %s", cpu, e)
+        return False
+
+    if cpu not in allowed:
+        logger.warning("CPU %d is not available to the daemon, not reserving it", cpu)
+        return False
+    if len(allowed) == 1:
+        logger.warning("Only CPU %d is available, not reserving it", cpu)
+        return False
+
+    os.sched_setaffinity(0, allowed - {cpu})
+    _reserved_cpu = cpu
+    logger.info("Reserved CPU %d for real-time IR transmission", cpu)
+    return True
+
+
+def enter_realtime(priority: int, cpu: Optional[int] = None) -> Optional[str]:
+    """
+    Pin the calling thread to ``cpu`` and move it to SCHED_FIFO at ``priority``.
+
+    On Linux both calls act on the calling thread only. Returns None on
+    success, or the reason real-time scheduling wasn't entered; the thread
+    is then left at normal priority. A busy-waiting SCHED_FIFO thread would
+    starve whatever else runs on its core, so with ``cpu`` given nothing is
+    changed unless reserve_cpu() reserved that core and pinning succeeds.
+    """
+    if cpu is not None:
+        if cpu != _reserved_cpu:
+            return f"CPU {cpu} is not reserved"
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except (AttributeError, OSError) as e:
+            return f"affinity: {e}"
+
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+    except PermissionError:
+        return "SCHED_FIFO needs CAP_SYS_NICE or LimitRTPRIO"
+    except (AttributeError, OSError) as e:
+        return f"SCHED_FIFO: {e}"
+
+    return None
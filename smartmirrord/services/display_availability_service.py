@@ -2,6 +2,9 @@ import logging
 import threading
 from typing import Optional
 
+from smartmirrord.services.ir_queue import PRIORITY_RECOVERY
+from smartmirrord.services.scheduler_service import ScheduledCall
+
 logger = logging.getLogger(__name__)
 
 
@@ -9,15 +12,16 @@ class DisplayAvailabilityService:
     POWER_ON_TIMEOUT = 20
     POWER_OFF_DELAY = 2
 
-    def __init__(self, power_service, ir_service):
+    def __init__(self, power_service, ir_service, scheduler):
         self._power_service = power_service
         self._ir_service = ir_service
+        self._scheduler = scheduler
 
         self._waiting_for_power_on = False
         self._power_on_event = threading.Event()
 
-        self._retry_timer: Optional[threading.Timer] = None
-        self._power_off_delay_timer: Optional[threading.Timer] = None
+        self._retry_timer: Optional[ScheduledCall] = None
+        self._power_off_delay_timer: Optional[ScheduledCall] = None
         self._lock = threading.Lock()
 
         self._running = False
@@ -85,24 +89,24 @@ class DisplayAvailabilityService:
             return
 
         if self._power_off_delay_timer:
-            self._power_off_delay_timer.cancel()
-
-        self._power_off_delay_timer = threading.Timer(
-            self.POWER_OFF_DELAY,
-            self._send_power_command,
-        )
-        self._power_off_delay_timer.daemon = True
-        self._power_off_delay_timer.start()
+            self._power_off_delay_timer.reschedule(self.POWER_OFF_DELAY)
+        else:
+            self._power_off_delay_timer = self._scheduler.call_later(
+                self.POWER_OFF_DELAY,
+                self._send_power_command,
+            )
 
     def _send_power_command(self) -> None:
         if not self._running:
             return
 
+        # Runs on the scheduler thread, so queue the command rather than
+        # waiting for it; the power-on timeout catches a failed send.
         try:
-            self._ir_service.send_command("power")
-            logger.debug("IR power command sent")
+            self._ir_service.submit("power", priority=PRIORITY_RECOVERY)
+            logger.debug("IR power command queued")
         except Exception:
-            logger.exception("Failed to send IR power command")
+            logger.exception("Failed to queue IR power command")
 
         self._start_power_on_timeout()
 
@@ -111,14 +115,12 @@ class DisplayAvailabilityService:
             return
 
         if self._retry_timer:
-            self._retry_timer.cancel()
-
-        self._retry_timer = threading.Timer(
-            self.POWER_ON_TIMEOUT,
-            self._on_power_on_timeout,
-        )
-        self._retry_timer.daemon = True
-        self._retry_timer.start()
+            self._retry_timer.reschedule(self.POWER_ON_TIMEOUT)
+        else:
+            self._retry_timer = self._scheduler.call_later(
+                self.POWER_ON_TIMEOUT,
+                self._on_power_on_timeout,
+            )
 
     def _on_power_on_timeout(self) -> None:
         with self._lock:
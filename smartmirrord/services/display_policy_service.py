@@ -1,7 +1,9 @@
 import threading
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from typing import Optional, List, Dict
 
+from smartmirrord.services.scheduler_service import ScheduledCall
+
 
 class QuietHoursSchedule:
     def __init__(self, quiet_hours: List[Dict]):
@@ -14,14 +16,39 @@ class QuietHoursSchedule:
     def is_motion_allowed(self, now: datetime) -> bool:
         now_t = now.time()
         for start, end in self._windows:
-            if start < end:
-                if start <= now_t < end:
-                    return False
-            else:
-                if now_t >= start or now_t < end:
-                    return False
+            if self._in_window(start, end, now_t):
+                return False
         return True
 
+    def next_allowed(self, now: datetime) -> datetime:
+        """Earliest moment at or after ``now`` when motion is allowed."""
+        t = now
+        # Each step jumps to the latest end of the windows covering t, which
+        # also walks through back-to-back or overlapping windows.
+        for _ in range(len(self._windows) + 1):
+            ends = [
+                self._window_end(start, end, t)
+                for start, end in self._windows
+                if self._in_window(start, end, t.time())
+            ]
+            if not ends:
+                return t
+            t = max(ends)
+        return t
+
+    @staticmethod
+    def _in_window(start: time, end: time, now_t: time) -> bool:
+        if start < end:
+            return start <= now_t < end
+        return now_t >= start or now_t < end
+
+    @staticmethod
+    def _window_end(start: time, end: time, now: datetime) -> datetime:
+        end_dt = datetime.combine(now.date(), end, now.tzinfo)
+        if start >= end and now.time() >= start:
+            end_dt += timedelta(days=1)
+        return end_dt
+
     @staticmethod
     def _parse_time(value: str) -> time:
         h, m = value.split(":")
@@ -36,7 +63,9 @@ class DisplayPolicyService:
         power_service,
         remute_delay: float,
         schedule_json: Dict,
+        scheduler,
     ):
+        self._scheduler = scheduler
         self._video = video_mute_service
         self._motion = motion_service
         self._power = power_service
@@ -47,7 +76,7 @@ class DisplayPolicyService:
         )
 
         self._videoMute_desired = True
-        self._remute_timer: Optional[threading.Timer] = None
+        self._remute_timer: Optional[ScheduledCall] = None
         self._lock = threading.Lock()
         self._running = False
 
@@ -66,14 +95,26 @@ class DisplayPolicyService:
             self._running = False
             self._cancel_remute_timer()
 
+    @property
+    def remute_delay(self) -> float:
+        return self._remute_delay
+
+    def is_motion_allowed(self, now: Optional[datetime] = None) -> bool:
+        return self._schedule.is_motion_allowed(now or datetime.now())
+
+    def next_motion_allowed(self, now: Optional[datetime] = None) -> datetime:
+        return self._schedule.next_allowed(now or datetime.now())
+
+    def is_unmute_desired(self) -> bool:
+        return not self._videoMute_desired
+
     def _on_motion(self):
         if not self._running:
             return
 
         with self._lock:
-            self._cancel_remute_timer()
-
             if not self._schedule.is_motion_allowed(datetime.now()):
+                self._cancel_remute_timer()
                 return
 
             if self._videoMute_desired:
@@ -86,23 +127,33 @@ class DisplayPolicyService:
         if not self._running:
             return
 
-        self._remute_timer = threading.Timer(
-            self._remute_delay,
-            self._on_remute_timer,
-        )
-        self._remute_timer.start()
+        # Motion bursts only extend the pending remute.
+        if self._remute_timer:
+            self._remute_timer.reschedule(self._remute_delay)
+        else:
+            self._remute_timer = self._scheduler.call_later(
+                self._remute_delay,
+                self._on_remute_timer,
+            )
 
     def _on_remute_timer(self):
         with self._lock:
             if not self._running:
                 return
 
+            # Motion pushed the remute out while this call was starting.
+            if self._remute_timer and self._remute_timer.active:
+                return
+
             self._remute_timer = None
 
             if not self._videoMute_desired:
                 self._videoMute_desired = True
                 self._video.mute()
 
+        # Back to waiting for a wake; let motion sampling speed up right away.
+        self._motion.wake()
+
     def _on_power_on(self):
         if not self._running:
             return
@@ -113,6 +164,8 @@ class DisplayPolicyService:
             else:
                 self._video.unmute()
 
+        self._motion.wake()
+
     def _on_power_off(self):
         if not self._running:
             return
@@ -0,0 +1,155 @@
+import heapq
+import itertools
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Sequence, Tuple
+
+# Lower value is sent first.
+PRIORITY_RECOVERY = 0
+PRIORITY_UI = 10
+
+
+class IRJob:
+    QUEUED = "queued"
+    SENDING = "sending"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        command: str,
+        priority: int,
+        hold: bool = False,
+        sequence: Optional[Sequence[str]] = None,
+        inter_key_delay: float = 0.0,
+    ):
+        self.id = uuid.uuid4().hex
+        self.command = command
+        self.priority = priority
+        self.repeat = 1
+        self.hold = hold
+        self.sequence = tuple(sequence) if sequence is not None else None
+        self.inter_key_delay = inter_key_delay
+        self.released = threading.Event()
+        self.preempted = False
+
+        self.status = self.QUEUED
+        self.error: Optional[BaseException] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+        self._done = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def release(self) -> None:
+        """End a hold job's repeat stream (no effect on normal jobs)."""
+        self.released.set()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        self.status = self.FAILED if error else self.DONE
+        self.finished_at = time.time()
+        self._done.set()
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "command": self.command,
+            "priority": self.priority,
+            "repeat": self.repeat,
+            "hold": self.hold,
+            "preempted": self.preempted,
+            "sequence": list(self.sequence) if self.sequence is not None else None,
+            "status": self.status,
+            "error": str(self.error) if self.error else None,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IRCommandQueue:
+    """
+    Bounded priority queue of IR jobs.
+
+    Jobs come out highest priority first, FIFO within a priority. Putting a
+    command that is already queued at the same priority doesn't add a job;
+    it bumps the queued job's repeat count and returns that job instead.
+    Hold jobs only coalesce with other hold jobs, and sequences never
+    coalesce.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._heap = []
+        self._seq = itertools.count()
+        self._queued: Dict[Tuple[str, int, bool], IRJob] = {}
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def put(
+        self,
+        command: str,
+        priority: int,
+        hold: bool = False,
+        sequence: Optional[Sequence[str]] = None,
+        inter_key_delay: float = 0.0,
+    ) -> IRJob:
+        key = (command, priority, hold)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("IR command queue is closed")
+
+            job = self._queued.get(key) if sequence is None else None
+            if job is not None:
+                job.repeat += 1
+                return job
+
+            if len(self._heap) >= self._maxsize:
+                raise queue.Full(f"IR command queue full ({self._maxsize} jobs)")
+
+            job = IRJob(command, priority, hold, sequence, inter_key_delay)
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            if sequence is None:
+                self._queued[key] = job
+            self._cond.notify()
+            return job
+
+    def has_waiting_above(self, priority: int) -> bool:
+        """Whether a job more urgent than ``priority`` is queued."""
+        with self._cond:
+            return bool(self._heap) and self._heap[0][0] < priority
+
+    def get(self) -> Optional[IRJob]:
+        """Block for the next job; returns None once the queue is closed."""
+        with self._cond:
+            while not self._heap and not self._closed:
+                self._cond.wait()
+
+            if self._closed:
+                return None
+
+            _, _, job = heapq.heappop(self._heap)
+            if job.sequence is None:
+                del self._queued[(job.command, job.priority, job.hold)]
+            job.status = IRJob.SENDING
+            return job
+
+    def close(self) -> None:
+        """Stop handing out jobs and fail everything still queued."""
+        with self._cond:
+            self._closed = True
+            pending = [job for _, _, job in self._heap]
+            self._heap.clear()
+            self._queued.clear()
+            self._cond.notify_all()
+
+        for job in pending:
+            job.finish(RuntimeError("IRService stopped"))
@@ -1,16 +1,58 @@
+import json
 import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
 from smartmirrord.hardware.ir_emulator import IREmulator
 from smartmirrord.hardware.ir_codes import CODES
+from smartmirrord.config import (
+    IR_QUEUE_SIZE,
+    IR_JOB_HISTORY,
+    IR_HOLD_MAX_SEC,
+    IR_SEQUENCE_KEY_DELAY_MS,
+    IR_MACROS,
+    IR_MACROS_PATH,
+    IR_REALTIME,
+    IR_REALTIME_PRIORITY,
+    IR_REALTIME_CPU,
+)
+from smartmirrord.realtime import enter_realtime
+from smartmirrord.services.ir_queue import IRCommandQueue, IRJob, PRIORITY_UI
 
 log = logging.getLogger(__name__)
 
 
 class IRService:
-    def __init__(self):
+    """
+    IR command front end.
+
+    All transmissions go through a single worker thread fed by a bounded
+    priority queue, so callers never race each other on the GPIO line and
+    can choose between waiting for completion (send_command) or getting a
+    job back immediately (submit).
+    """
+
+    def __init__(
+        self,
+        macros: Optional[Dict[str, List[str]]] = None,
+        realtime: bool = IR_REALTIME,
+    ):
         self._ir_emulator = IREmulator()
         self._commands = list(CODES.keys())
+        self._command_set = frozenset(self._commands)
+        self._macros = self._load_macros(IR_MACROS if macros is None else macros)
         self._running = False
 
+        self._realtime = realtime
+        self._realtime_status = "off"
+
+        self._queue: Optional[IRCommandQueue] = None
+        self._worker: Optional[threading.Thread] = None
+
+        self._jobs: "OrderedDict[str, IRJob]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+
         log.info("IRService constructed")
 
     def start(self):
@@ -19,6 +61,10 @@ class IRService:
             return
 
         self._ir_emulator.start()
+
+        self._queue = IRCommandQueue(IR_QUEUE_SIZE)
+        self._worker = threading.Thread(target=self._run, name="ir-worker", daemon=True)
+        self._worker.start()
         self._running = True
 
         log.info("IRService started")
@@ -27,22 +73,211 @@ class IRService:
         if not self._running:
             return
 
-        self._ir_emulator.stop()
         self._running = False
+        with self._jobs_lock:
+            for job in self._jobs.values():
+                job.release()
+        self._queue.close()
+        self._worker.join()
+        self._worker = None
+
+        self._ir_emulator.stop()
 
         log.info("IRService stopped")
 
     def list_commands(self):
         return self._commands
 
-    def send_command(self, command: str):
+    def list_macros(self) -> Dict[str, List[str]]:
+        return {name: list(keys) for name, keys in self._macros.items()}
+
+    def timing_stats(self) -> dict:
+        stats = self._ir_emulator.timing_stats.as_dict()
+        stats["realtime"] = self._realtime_status
+        return stats
+
+    def submit(self, command: str, priority: int = PRIORITY_UI, hold: bool = False) -> IRJob:
+        """
+        Queue a command and return its job without waiting.
+
+        An identical command already queued at the same priority is
+        coalesced: its job's repeat count goes up and that job is returned.
+        Raises queue.Full when the queue is at capacity.
+        """
         if not self._running:
             log.warning("Attempted IR send while service not running")
             raise RuntimeError("IRService is not running")
 
+        command = self._validate(command)
+        job = self._queue.put(command, priority, hold)
+        self._remember(job)
+
+        log.debug("Queued IR command: %s (job=%s repeat=%d)", command, job.id, job.repeat)
+        return job
+
+    def send_command(self, command: str, priority: int = PRIORITY_UI):
+        """Queue a command and block until it has been transmitted."""
+        job = self.submit(command, priority)
+        job.wait()
+        if job.error:
+            raise job.error
+
+    def submit_sequence(
+        self,
+        commands: Sequence[str],
+        inter_key_delay: Optional[float] = None,
+        priority: int = PRIORITY_UI,
+        name: str = "sequence",
+    ) -> IRJob:
+        """
+        Queue several commands as one job, sent back to back by the worker.
+
+        Every command is validated before anything is queued, so a typo
+        halfway through a menu sequence sends nothing.
+        """
+        if not self._running:
+            log.warning("Attempted IR send while service not running")
+            raise RuntimeError("IRService is not running")
+
+        if isinstance(commands, str) or not isinstance(commands, (list, tuple)):
+            raise ValueError("IR command sequence must be a list of commands")
+        if not commands:
+            raise ValueError("Empty IR command sequence")
+        commands = [self._validate(command) for command in commands]
+
+        if inter_key_delay is None:
+            inter_key_delay = IR_SEQUENCE_KEY_DELAY_MS / 1000.0
+        elif (
+            isinstance(inter_key_delay, bool)
+            or not isinstance(inter_key_delay, (int, float))
+            or not 0 <= inter_key_delay < float("inf")
+        ):
+            raise ValueError(f"Invalid inter-key delay: {inter_key_delay!r}")
+
+        job = self._queue.put(name, priority, sequence=commands, inter_key_delay=inter_key_delay)
+        self._remember(job)
+
+        log.debug("Queued IR sequence %s: %s (job=%s)", name, commands, job.id)
+        return job
+
+    def send_sequence(
+        self,
+        commands: Sequence[str],
+        inter_key_delay: Optional[float] = None,
+        priority: int = PRIORITY_UI,
+    ):
+        """Queue a command sequence and block until all of it has been sent."""
+        job = self.submit_sequence(commands, inter_key_delay, priority)
+        job.wait()
+        if job.error:
+            raise job.error
+
+    def submit_macro(self, name: str, inter_key_delay: Optional[float] = None) -> IRJob:
+        macro = self._macros.get(name) if isinstance(name, str) else None
+        if macro is None:
+            raise ValueError(f"Unknown IR macro: {name}")
+        return self.submit_sequence(macro, inter_key_delay, name=name)
+
+    def hold(self, command: str, priority: int = PRIORITY_UI) -> IRJob:
+        """
+        Start holding a key, e.g. for a volume ramp.
+
+        The worker re-sends the full frame every 108 ms until release() is
+        called with the returned job's id or IR_HOLD_MAX_SEC passes. Commands
+        at the same or lower priority wait while a hold is streaming; a more
+        urgent one ends the hold and marks the job preempted.
+        """
+        return self.submit(command, priority, hold=True)
+
+    def release(self, job_id: str) -> Optional[IRJob]:
+        job = self.get_job(job_id)
+        if job is not None:
+            job.release()
+        return job
+
+    def get_job(self, job_id: str) -> Optional[IRJob]:
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def _validate(self, command: str) -> str:
+        if not isinstance(command, str):
+            raise ValueError(f"IR command must be a string, not {command!r}")
         command = command.lower()
-        if command not in self._commands:
+        if command not in self._command_set:
             raise ValueError(f"Unknown IR command: {command}")
+        return command
+
+    def _load_macros(self, macros: Dict[str, List[str]]) -> Dict[str, tuple]:
+        macros = dict(macros)
+        if IR_MACROS_PATH:
+            try:
+                with open(IR_MACROS_PATH) as f:
+                    macros.update(json.load(f))
+            except (OSError, ValueError):
+                log.exception("Failed to load IR macros from %s", IR_MACROS_PATH)
+
+        loaded = {}
+        for name, keys in macros.items():
+            try:
+                loaded[name] = tuple(self._validate(key) for key in keys)
+            except (ValueError, AttributeError, TypeError):
+                log.error("Ignoring IR macro %s with invalid keys: %r", name, keys)
+        return loaded
+
+    def _remember(self, job: IRJob) -> None:
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+            self._jobs.move_to_end(job.id)
+            while len(self._jobs) > IR_JOB_HISTORY:
+                self._jobs.popitem(last=False)
+
+    def _enter_realtime(self):
+        error = enter_realtime(IR_REALTIME_PRIORITY, IR_REALTIME_CPU)
+        if error:
+            self._realtime_status = f"fallback: {error}"
+            log.warning("IR worker running without real-time scheduling (%s)", error)
+        else:
+            self._realtime_status = "active"
+            log.info(
+                "IR worker running SCHED_FIFO priority %d on CPU %d",
+                IR_REALTIME_PRIORITY,
+                IR_REALTIME_CPU,
+            )
+
+    def _preempt_hold(self, job: IRJob) -> bool:
+        if self._queue.has_waiting_above(job.priority):
+            job.preempted = True
+        return job.preempted
+
+    def _run(self):
+        if self._realtime:
+            self._enter_realtime()
+        log.debug("IR worker running")
+
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            log.debug("Sending IR command: %s x%d", job.command, job.repeat)
+            try:
+                if job.sequence is not None:
+                    self._ir_emulator.send_sequence(job.sequence, job.inter_key_delay)
+                elif job.hold:
+                    sent = self._ir_emulator.hold(
+                        job.command,
+                        job.released,
+                        IR_HOLD_MAX_SEC,
+                        preempt=lambda: self._preempt_hold(job),
+                    )
+                    log.debug("IR hold on %s ended after %d repeats", job.command, sent)
+                else:
+                    for _ in range(job.repeat):
+                        self._ir_emulator.send(job.command)
+            except Exception as e:
+                log.exception("IR send failed (%s)", job.command)
+                job.finish(e)
+            else:
+                job.finish()
 
-        log.debug("Sending IR command: %s", command)
-        self._ir_emulator.send(command)
+        log.debug("IR worker exiting")
@@ -0,0 +1,326 @@
+import logging
+import time
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from smartmirrord.config import (
+    MOTION_WIDTH,
+    MOTION_HEIGHT,
+    MOTION_THRESHOLD,
+    MOTION_DETECTOR,
+    MOTION_BACKGROUND_ALPHA,
+    MOTION_ZONE_ROWS,
+    MOTION_ZONE_COLS,
+    MOTION_ZONE_THRESHOLDS,
+    MOTION_IGNORE_ZONES,
+    MOTION_MASK_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+DETECTOR_FRAME_DIFF = "frame_diff"
+DETECTOR_BACKGROUND = "background"
+
+
+class MotionPipeline:
+    """
+    Motion pipeline backed by preallocated buffers.
+
+    Every OpenCV stage writes into a buffer owned by the pipeline via its
+    ``dst=`` argument, and the previous/current blurred frames are swapped
+    rather than reallocated. Buffers are only (re)allocated when the input
+    shape changes; ``last_frame_allocations`` reports how many happened while
+    processing the most recent frame, so steady state should read zero.
+
+    Changed pixels are compared either against the previous frame
+    (``frame_diff``) or against an exponentially weighted running average
+    (``background``), then scored per zone of a ``rows x cols`` grid. Motion
+    is reported when any zone's score exceeds that zone's threshold. Ignored
+    zones and black pixels of the optional mask image never score.
+    """
+
+    BLUR_KSIZE = (5, 5)
+    DIFF_THRESHOLD = 15
+
+    STAGES = ("gray", "resize", "blur", "reference", "diff", "threshold", "score")
+
+    def __init__(
+        self,
+        width: int = MOTION_WIDTH,
+        height: int = MOTION_HEIGHT,
+        detector: str = MOTION_DETECTOR,
+        background_alpha: float = MOTION_BACKGROUND_ALPHA,
+        zone_rows: int = MOTION_ZONE_ROWS,
+        zone_cols: int = MOTION_ZONE_COLS,
+        zone_thresholds: Optional[List[int]] = None,
+        ignore_zones: Optional[List[int]] = None,
+        mask_path: str = MOTION_MASK_PATH,
+        profile: bool = False,
+    ):
+        if detector not in (DETECTOR_FRAME_DIFF, DETECTOR_BACKGROUND):
+            raise ValueError(f"Unknown motion detector: {detector}")
+
+        self.width = width
+        self.height = height
+        self.detector = detector
+        self.background_alpha = background_alpha
+
+        shape = (height, width)
+        self._small = np.empty(shape, dtype=np.uint8)
+        self._current = np.empty(shape, dtype=np.uint8)
+        self._previous = np.empty(shape, dtype=np.uint8)
+        self._diff = np.empty(shape, dtype=np.uint8)
+        self._thresh = np.empty(shape, dtype=np.uint8)
+        self.total_allocations = 5
+
+        # Source-resolution grayscale buffer, sized on first colour frame.
+        self._gray: Optional[np.ndarray] = None
+
+        if detector == DETECTOR_BACKGROUND:
+            self._background = np.empty(shape, dtype=np.float32)
+            self._background_u8 = np.empty(shape, dtype=np.uint8)
+            self.total_allocations += 2
+
+        self._setup_zones(
+            zone_rows,
+            zone_cols,
+            MOTION_ZONE_THRESHOLDS if zone_thresholds is None else zone_thresholds,
+            MOTION_IGNORE_ZONES if ignore_zones is None else ignore_zones,
+            mask_path,
+        )
+
+        self._primed = False
+        self._motion = False
+        self.last_score: Optional[int] = None
+        # Motion-size luma of the last frame, before blurring.
+        self.last_gray: Optional[np.ndarray] = None
+
+        self.frames = 0
+        self.last_frame_allocations = 0
+
+        # Cumulative nanoseconds per stage; only collected when profiling.
+        self._profile = profile
+        self.stage_ns = dict.fromkeys(self.STAGES, 0)
+        self._stage_start = 0
+
+    def _setup_zones(self, rows, cols, thresholds, ignored, mask_path) -> None:
+        self.zone_rows = rows
+        self.zone_cols = cols
+        count = rows * cols
+
+        if not thresholds:
+            thresholds = [MOTION_THRESHOLD] * count
+        elif len(thresholds) == 1:
+            thresholds = thresholds * count
+        elif len(thresholds) != count:
+            raise ValueError(
+                f"Expected {count} zone thresholds for a {rows}x{cols} grid, "
+                f"got {len(thresholds)}"
+            )
+        self._zone_thresholds = np.array(thresholds, dtype=np.int32)
+
+        self._ignored = sorted(set(ignored))
+        if any(zone < 0 or zone >= count for zone in self._ignored):
+            raise ValueError(f"Ignored zones {self._ignored} outside {rows}x{cols} grid")
+
+        ys = np.linspace(0, self.height, rows + 1).astype(np.intp)
+        xs = np.linspace(0, self.width, cols + 1).astype(np.intp)
+
+        mask = np.full((self.height, self.width), 255, dtype=np.uint8)
+        if mask_path:
+            image = cv2.imread(mask_path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                logger.error("Failed to load motion mask %s; ignoring it", mask_path)
+            else:
+                image = cv2.resize(
+                    image, (self.width, self.height), interpolation=cv2.INTER_NEAREST
+                )
+                mask[image == 0] = 0
+        for zone in self._ignored:
+            r, c = divmod(zone, cols)
+            mask[ys[r]:ys[r + 1], xs[c]:xs[c + 1]] = 0
+        self._mask = mask if mask.min() == 0 else None
+
+        # Zone sums come from the integral image: four corner lookups per zone,
+        # done with np.take into preallocated buffers.
+        stride = self.width + 1
+        y0, x0 = np.meshgrid(ys[:-1], xs[:-1], indexing="ij")
+        y1, x1 = np.meshgrid(ys[1:], xs[1:], indexing="ij")
+        self._corner_br = (y1 * stride + x1).ravel()
+        self._corner_tr = (y0 * stride + x1).ravel()
+        self._corner_bl = (y1 * stride + x0).ravel()
+        self._corner_tl = (y0 * stride + x0).ravel()
+
+        self._integral = np.empty((self.height + 1, self.width + 1), dtype=np.int32)
+        self._zone_scores = np.zeros(count, dtype=np.int32)
+        self._zone_peaks = np.zeros(count, dtype=np.int32)
+        self._zone_tmp = np.empty(count, dtype=np.int32)
+        self._zone_hits = np.zeros(count, dtype=bool)
+        self.total_allocations += 6
+
+    def reset(self) -> None:
+        """Forget the previous frame, e.g. after the camera restarts."""
+        self._primed = False
+        self._motion = False
+
+    def is_motion(self) -> bool:
+        """Whether the last processed frame crossed any zone threshold."""
+        return self._motion
+
+    def zone_report(self) -> dict:
+        return {
+            "detector": self.detector,
+            "rows": self.zone_rows,
+            "cols": self.zone_cols,
+            "ignored": self._ignored,
+            "thresholds": self._zone_thresholds.tolist(),
+            "scores": self._zone_scores.tolist(),
+            "peaks": self._zone_peaks.tolist(),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "total_allocations": self.total_allocations,
+            "last_frame_allocations": self.last_frame_allocations,
+        }
+
+    def process(self, frame: np.ndarray) -> Optional[int]:
+        """
+        Run one frame through the pipeline.
+
+        Returns the total number of changed, unmasked pixels, or None while
+        the pipeline is still priming.
+        """
+        self.last_frame_allocations = 0
+        self.frames += 1
+        self._motion = False
+        self.last_score = None
+
+        if self._profile:
+            self._stage_start = time.perf_counter_ns()
+
+        gray = self._to_gray(frame)
+        self._mark("gray")
+        small = self._to_motion_size(gray)
+        self.last_gray = small
+        self._mark("resize")
+        self._current = self._checked(
+            cv2.GaussianBlur(small, self.BLUR_KSIZE, 0, dst=self._current),
+            self._current,
+        )
+        self._mark("blur")
+
+        if not self._primed:
+            if self.detector == DETECTOR_BACKGROUND:
+                np.copyto(self._background, self._current)
+            self._swap()
+            self._primed = True
+            return None
+
+        if self.detector == DETECTOR_BACKGROUND:
+            reference = cv2.convertScaleAbs(self._background, dst=self._background_u8)
+            self._background_u8 = self._checked(reference, self._background_u8)
+        else:
+            reference = self._previous
+        self._mark("reference")
+
+        self._diff = self._checked(
+            cv2.absdiff(reference, self._current, dst=self._diff),
+            self._diff,
+        )
+
+        if self.detector == DETECTOR_BACKGROUND:
+            cv2.accumulateWeighted(self._current, self._background, self.background_alpha)
+        self._mark("diff")
+
+        # Binary 0/1 so counts and integral sums are pixel counts.
+        _, thresh = cv2.threshold(
+            self._diff, self.DIFF_THRESHOLD, 1, cv2.THRESH_BINARY, dst=self._thresh
+        )
+        self._thresh = self._checked(thresh, self._thresh)
+        if self._mask is not None:
+            cv2.bitwise_and(self._thresh, self._mask, dst=self._thresh)
+        self._mark("threshold")
+
+        score = self._score_zones()
+        self._mark("score")
+
+        self.last_score = score
+        self._swap()
+        return score
+
+    def _mark(self, stage: str) -> None:
+        if self._profile:
+            now = time.perf_counter_ns()
+            self.stage_ns[stage] += now - self._stage_start
+            self._stage_start = now
+
+    def _score_zones(self) -> int:
+        scores = self._zone_scores
+
+        if scores.size == 1:
+            scores[0] = cv2.countNonZero(self._thresh)
+        else:
+            self._integral = self._checked(
+                cv2.integral(self._thresh, sum=self._integral, sdepth=cv2.CV_32S),
+                self._integral,
+            )
+            flat = self._integral.reshape(-1)
+            tmp = self._zone_tmp
+            np.take(flat, self._corner_br, out=scores)
+            np.take(flat, self._corner_tr, out=tmp)
+            np.subtract(scores, tmp, out=scores)
+            np.take(flat, self._corner_bl, out=tmp)
+            np.subtract(scores, tmp, out=scores)
+            np.take(flat, self._corner_tl, out=tmp)
+            np.add(scores, tmp, out=scores)
+
+        np.maximum(self._zone_peaks, scores, out=self._zone_peaks)
+        np.greater(scores, self._zone_thresholds, out=self._zone_hits)
+        self._motion = bool(self._zone_hits.any())
+
+        return int(scores.sum())
+
+    def _to_gray(self, frame: np.ndarray) -> np.ndarray:
+        if frame.ndim == 2:
+            return frame
+
+        shape = frame.shape[:2]
+        if self._gray is None or self._gray.shape != shape:
+            self._gray = np.empty(shape, dtype=np.uint8)
+            self._count_allocation()
+
+        self._gray = self._checked(
+            cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY, dst=self._gray),
+            self._gray,
+        )
+        return self._gray
+
+    def _to_motion_size(self, gray: np.ndarray) -> np.ndarray:
+        # Lores capture already delivers a motion-sized luma plane.
+        if gray.shape == self._small.shape:
+            return gray
+
+        self._small = self._checked(
+            cv2.resize(gray, (self.width, self.height), dst=self._small),
+            self._small,
+        )
+        return self._small
+
+    def _swap(self) -> None:
+        self._previous, self._current = self._current, self._previous
+
+    def _checked(self, result: np.ndarray, buffer: np.ndarray) -> np.ndarray:
+        # OpenCV silently reallocates dst if its shape or type doesn't fit.
+        if result is not buffer:
+            self._count_allocation()
+        return result
+
+    def _count_allocation(self) -> None:
+        self.last_frame_allocations += 1
+        self.total_allocations += 1
+        if self._primed:
+            logger.debug("MotionPipeline allocated a frame buffer in steady state")
@@ -0,0 +1,234 @@
+import logging
+import multiprocessing
+import threading
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _motion_child(conn, interval: float, capture: bool) -> None:
+    """Child process entry point: capture, detect, report hits over conn."""
+    from smartmirrord.logging_config import setup_logging
+    from smartmirrord.services.motion_service import MotionService
+
+    # Only the parent writes the rotating log file; the child logs to stderr.
+    setup_logging(log_to_file=False)
+
+    service = MotionService(use_process=False)
+    source = service.frame_source
+    source.start()
+    if not capture:
+        source.pause()
+    logger.info("Motion child process running (pid=%s)", multiprocessing.current_process().pid)
+
+    try:
+        while True:
+            # Waiting on the pipe doubles as the frame interval, so commands
+            # from the parent are picked up immediately. While suspended
+            # there is nothing to do until the parent says otherwise.
+            if conn.poll(interval if capture else None):
+                command, value = conn.recv()
+                if command == "stop":
+                    break
+                if command == "interval":
+                    interval = value
+                elif command == "capture" and value != capture:
+                    capture = value
+                    if capture:
+                        source.resume()
+                    else:
+                        source.pause()
+                        service.pipeline.reset()
+                    logger.info("Motion capture %s", "resumed" if capture else "suspended")
+                continue
+
+            frame = source.read_frame()
+            if frame is None:
+                continue
+
+            now = time.time()
+            if service.process_frame(frame, now):
+                conn.send(("motion", now))
+    except (EOFError, BrokenPipeError):
+        logger.warning("Motion child lost its parent; exiting")
+    finally:
+        source.stop()
+        conn.close()
+
+
+class MotionProcessRunner:
+    """
+    Runs capture and detection in a child process.
+
+    Frames never leave the child; only small ``("motion", timestamp)``
+    messages cross the pipe back to the parent, where ``on_motion`` is
+    called from a monitor thread. The monitor also
+    forwards sampling interval and capture suspension changes and restarts
+    the child with backoff if it dies.
+    """
+
+    RESTART_BACKOFF = (1, 2, 5, 10, 30)
+    STOP_TIMEOUT = 3.0
+
+    def __init__(
+        self,
+        on_motion: Callable[[], None],
+        interval_provider: Callable[[], float],
+        suspend_provider: Callable[[], float],
+    ):
+        self._on_motion = on_motion
+        self._interval_provider = interval_provider
+        self._suspend_provider = suspend_provider
+
+        # spawn avoids forking a process that already runs several threads.
+        self._ctx = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._send_lock = threading.Lock()
+
+        self._interval: Optional[float] = None
+        self._capture = True
+        self._restarts = 0
+        self._spawned_at = 0.0
+
+        self._running = False
+        self._stop_event = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._running:
+            return
+
+        self._running = True
+        self._stop_event.clear()
+        self._spawn()
+
+        self._monitor = threading.Thread(
+            target=self._monitor_loop, name="motion-process-monitor", daemon=True
+        )
+        self._monitor.start()
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+
+        self._running = False
+        self._stop_event.set()
+
+        if self._monitor:
+            self._monitor.join()
+            self._monitor = None
+
+        self._send(("stop", None))
+        self._close_child()
+
+    def update_sampling(self) -> None:
+        """Push interval and capture suspension changes to the child."""
+        capture = self._suspend_provider() <= 0
+        if capture != self._capture and self._send(("capture", capture)):
+            self._capture = capture
+
+        interval = self._interval_provider()
+        if interval != self._interval and self._send(("interval", interval)):
+            self._interval = interval
+
+    def _spawn(self) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        self._interval = self._interval_provider()
+        self._capture = self._suspend_provider() <= 0
+
+        self._process = self._ctx.Process(
+            target=_motion_child,
+            args=(child_conn, self._interval, self._capture),
+            name="motion-capture",
+            daemon=True,
+        )
+        self._process.start()
+        self._spawned_at = time.monotonic()
+        child_conn.close()
+        self._conn = parent_conn
+
+        logger.info("Motion child process started (pid=%s)", self._process.pid)
+
+    def _send(self, message) -> bool:
+        with self._send_lock:
+            if self._conn is None:
+                return False
+            try:
+                self._conn.send(message)
+                return True
+            except (OSError, BrokenPipeError):
+                return False
+
+    def _close_child(self) -> Optional[int]:
+        """Wait for the child to exit, forcing it if needed, and release it."""
+        with self._send_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        process = self._process
+        if process is None:
+            return None
+
+        process.join(self.STOP_TIMEOUT)
+        if process.is_alive():
+            logger.warning("Motion child did not exit; terminating")
+            process.terminate()
+            process.join(self.STOP_TIMEOUT)
+        if process.is_alive():
+            logger.error("Motion child ignored SIGTERM; killing")
+            process.kill()
+            process.join()
+
+        # Process.close() raises on a live process, so only now is it safe.
+        exitcode = process.exitcode
+        process.close()
+        self._process = None
+        return exitcode
+
+    def _monitor_loop(self) -> None:
+        while self._running:
+            died = False
+
+            for ready in wait([self._conn, self._process.sentinel], timeout=0.5):
+                if ready is self._process.sentinel:
+                    died = True
+                    continue
+                try:
+                    message = self._conn.recv()
+                except (EOFError, OSError):
+                    died = True
+                    continue
+                if message[0] == "motion":
+                    self._on_motion()
+
+            if not self._running:
+                break
+
+            if died:
+                self._restart()
+            else:
+                self.update_sampling()
+
+    def _restart(self) -> None:
+        # EOF on the pipe can arrive before the child has actually exited.
+        exitcode = self._close_child()
+
+        # A child that ran for a while earns a fresh backoff sequence.
+        if time.monotonic() - self._spawned_at > self.RESTART_BACKOFF[-1] * 2:
+            self._restarts = 0
+
+        delay = self.RESTART_BACKOFF[min(self._restarts, len(self.RESTART_BACKOFF) - 1)]
+        self._restarts += 1
+        logger.error(
+            "Motion child process exited (code=%s); restarting in %ss",
+            exitcode,
+            delay,
+        )
+
+        if self._stop_event.wait(delay):
+            return
+        self._spawn()
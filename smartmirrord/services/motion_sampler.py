@@ -0,0 +1,111 @@
+import logging
+import threading
+from datetime import datetime
+from enum import Enum
+
+from smartmirrord.config import (
+    MOTION_INTERVAL_WAKE,
+    MOTION_INTERVAL_HOLD,
+    MOTION_INTERVAL_QUIET,
+    MOTION_SUSPEND_CAMERA,
+    MOTION_CAMERA_WARMUP_SEC,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingTier(Enum):
+    WAKE = "wake"    # display muted, waiting for someone to walk up
+    HOLD = "hold"    # display unmuted, only need to keep the remute timer alive
+    QUIET = "quiet"  # quiet hours or panel off, motion can't be acted on
+
+
+class AdaptiveMotionSampler:
+    """
+    Picks the motion frame interval from display and schedule state.
+
+    Sampling runs fast only while a hit would actually wake the display.
+    Once unmuted a single hit per remute window is enough, and during quiet
+    hours or while the panel is off events are discarded anyway.
+
+    With ``suspend_camera`` the sampler also tells MotionService to stop
+    capturing altogether in those states, resuming ``warmup`` seconds before
+    quiet hours end so the first frames are ready at the boundary.
+    """
+
+    # Longest single suspension before state is re-evaluated; power-on and
+    # remute wake MotionService early anyway.
+    SUSPEND_RECHECK = 300.0
+
+    def __init__(
+        self,
+        power_service,
+        display_policy_service,
+        wake_interval: float = MOTION_INTERVAL_WAKE,
+        hold_interval: float = MOTION_INTERVAL_HOLD,
+        quiet_interval: float = MOTION_INTERVAL_QUIET,
+        suspend_camera: bool = MOTION_SUSPEND_CAMERA,
+        warmup: float = MOTION_CAMERA_WARMUP_SEC,
+    ):
+        self._power = power_service
+        self._policy = display_policy_service
+        self._suspend_camera = suspend_camera
+        self._warmup = warmup
+
+        self._intervals = {
+            SamplingTier.WAKE: wake_interval,
+            # Sample at least a few times per remute window so a person who
+            # is still there never lets the display fall back to muted.
+            SamplingTier.HOLD: min(hold_interval, display_policy_service.remute_delay / 3),
+            SamplingTier.QUIET: quiet_interval,
+        }
+
+        self._tier = SamplingTier.WAKE
+        self._lock = threading.Lock()
+
+    @property
+    def tier(self) -> SamplingTier:
+        return self._tier
+
+    def current_tier(self) -> SamplingTier:
+        if not self._power.is_power_on() or not self._policy.is_motion_allowed():
+            return SamplingTier.QUIET
+        if self._policy.is_unmute_desired():
+            return SamplingTier.HOLD
+        return SamplingTier.WAKE
+
+    def capture_suspended_for(self) -> float:
+        """Seconds capture can stay suspended from now; 0 means capture."""
+        if not self._suspend_camera:
+            return 0.0
+
+        if not self._power.is_power_on():
+            return self.SUSPEND_RECHECK
+
+        remaining = self._seconds_until_motion_allowed() - self._warmup
+        if remaining <= 0:
+            return 0.0
+        return min(remaining, self.SUSPEND_RECHECK)
+
+    def interval(self) -> float:
+        tier = self.current_tier()
+
+        with self._lock:
+            if tier is not self._tier:
+                logger.info(
+                    "Motion sampling tier %s -> %s (%.2fs)",
+                    self._tier.value,
+                    tier.value,
+                    self._intervals[tier],
+                )
+                self._tier = tier
+
+        interval = self._intervals[tier]
+        if tier is SamplingTier.QUIET and self._power.is_power_on():
+            # Don't sleep past the end of quiet hours.
+            interval = min(interval, self._seconds_until_motion_allowed())
+        return interval
+
+    def _seconds_until_motion_allowed(self) -> float:
+        now = datetime.now()
+        return (self._policy.next_motion_allowed(now) - now).total_seconds()
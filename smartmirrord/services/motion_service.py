@@ -1,27 +1,49 @@
 import threading
 import time
-import cv2
 import logging
 from typing import Callable, Optional, List
-from smartmirrord.hardware.camera import Camera
-from smartmirrord.config import (
-    MOTION_WIDTH, MOTION_HEIGHT, MOTION_THRESHOLD, MOTION_COOLDOWN_SEC
-)
+from smartmirrord.hardware.frame_sources import FrameSource
+from smartmirrord.services.motion_pipeline import MotionPipeline
+from smartmirrord.services.motion_process import MotionProcessRunner
+from smartmirrord.config import MOTION_COOLDOWN_SEC, MOTION_INTERVAL_WAKE, MOTION_PROCESS
 
 logger = logging.getLogger(__name__)
 
 
 class MotionService:
-    def __init__(self):
-        self.camera = Camera()
+    RESUME_RETRY_DELAY = 5.0
+
+    def __init__(
+        self,
+        frame_source: Optional[FrameSource] = None,
+        pipeline: Optional[MotionPipeline] = None,
+        use_process: bool = MOTION_PROCESS,
+    ):
+        self._use_process = use_process
+        self._runner: Optional[MotionProcessRunner] = None
+
+        if frame_source is None and not use_process:
+            # Imported lazily so file-backed replay works without picamera2.
+            from smartmirrord.hardware.camera import Camera
+            frame_source = Camera()
+        self.frame_source = frame_source
 
         self._handlers: List[Callable[[], None]] = []
 
         self.thread: Optional[threading.Thread] = None
         self.running = False
 
-        self.last_frame = None
-        self.last_motion_time = 0
+        # In process mode detection happens in the child, which builds its own.
+        self._pipeline: Optional[MotionPipeline] = (
+            None if use_process else pipeline or MotionPipeline()
+        )
+        # None until the first event, so a source clock starting at 0.0
+        # (replayed recordings) isn't inside the cooldown from the start.
+        self.last_motion_time: Optional[float] = None
+
+        self._sampler = None
+        self._wake_event = threading.Event()
+        self._capturing = False
 
         self._lock = threading.Lock()
 
@@ -30,12 +52,36 @@ class MotionService:
             self._handlers.append(handler)
         logger.debug("Registered motion handler: %s", getattr(handler, "__name__", repr(handler)))
 
+    def set_sampler(self, sampler) -> None:
+        """Use sampler.interval() to pace frames instead of a fixed rate."""
+        self._sampler = sampler
+
+    def wake(self) -> None:
+        """Cut the current frame wait short so the interval is re-evaluated."""
+        self._wake_event.set()
+        if self._runner:
+            self._runner.update_sampling()
+
+    @property
+    def pipeline(self) -> Optional[MotionPipeline]:
+        return self._pipeline
+
     def start(self):
         if self.running:
             logger.debug("MotionService already running; start() ignored")
             return
 
-        self.camera.start()
+        if self._use_process:
+            self._runner = MotionProcessRunner(
+                self._emit_motion, self._current_interval, self._capture_suspended_for
+            )
+            self._runner.start()
+            self.running = True
+            logger.debug("MotionService child process started")
+            return
+
+        self.frame_source.start()
+        self._capturing = True
         self.running = True
         self.thread = threading.Thread(target=self._run, daemon=True, name="MotionService")
         self.thread.start()
@@ -47,14 +93,57 @@ class MotionService:
             return
 
         self.running = False
+        self._wake_event.set()
+
+        if self._runner:
+            self._runner.stop()
+            self._runner = None
+            logger.debug("MotionService stopped")
+            return
+
         if self.thread:
             self.thread.join()
             self.thread = None
 
-        self.camera.stop()
-        self.last_frame = None
+        self.frame_source.stop()
+        self._capturing = False
+        self._pipeline.reset()
         logger.debug("MotionService stopped")
 
+    def pipeline_stats(self) -> Optional[dict]:
+        """Detector stats, or None when detection runs in the child process."""
+        return self._pipeline.stats() if self._pipeline else None
+
+    def zone_report(self) -> Optional[dict]:
+        """Zone scores, or None when detection runs in the child process."""
+        return self._pipeline.zone_report() if self._pipeline else None
+
+    def reset_detection(self) -> None:
+        """Forget the previous frame and the cooldown, e.g. before a new recording."""
+        self._pipeline.reset()
+        self.last_motion_time = None
+
+    def process_frame(self, frame, now: float) -> bool:
+        """
+        Run one frame through detection and cooldown, emitting motion
+        handlers on a hit. Returns True if motion was emitted.
+        """
+        motion_score = self._pipeline.process(frame)
+        if motion_score is None:
+            return False
+
+        if self._pipeline.is_motion() and (
+            self.last_motion_time is None
+            or now - self.last_motion_time >= MOTION_COOLDOWN_SEC
+        ):
+            self.last_motion_time = now
+            logger.info("Motion detected (score=%s)", motion_score)
+            logger.debug("Motion zone scores: %s", self._pipeline.zone_report()["scores"])
+            self._emit_motion()
+            return True
+
+        return False
+
     def _emit_motion(self):
         with self._lock:
             handlers = list(self._handlers)
@@ -71,33 +160,57 @@ class MotionService:
     def _run(self):
         logger.debug("MotionService loop running")
         while self.running:
-            frame = self.camera.read_frame()
-            if frame is None:
-                time.sleep(0.01)
+            suspend = self._capture_suspended_for()
+            if suspend > 0:
+                self._pause_capture()
+                self._wake_event.wait(suspend)
+                self._wake_event.clear()
                 continue
 
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-            gray = cv2.resize(gray, (MOTION_WIDTH, MOTION_HEIGHT))
-            gray = cv2.GaussianBlur(gray, (5, 5), 0)
+            if not self._capturing and not self._resume_capture():
+                continue
 
-            if self.last_frame is None:
-                self.last_frame = gray
+            frame = self.frame_source.read_frame()
+            if frame is None:
+                time.sleep(0.01)
                 continue
 
-            diff = cv2.absdiff(self.last_frame, gray)
-            _, thresh = cv2.threshold(diff, 15, 255, cv2.THRESH_BINARY)
-            motion_score = cv2.countNonZero(thresh)
+            self.process_frame(frame, time.time())
+            self._wait_for_next_frame()
 
-            now = time.time()
-            if (
-                motion_score > MOTION_THRESHOLD
-                and now - self.last_motion_time >= MOTION_COOLDOWN_SEC
-            ):
-                self.last_motion_time = now
-                logger.info("Motion detected (score=%s)", motion_score)
-                self._emit_motion()
+        logger.debug("MotionService loop exiting")
 
-            self.last_frame = gray
-            time.sleep(0.05)
+    def _pause_capture(self) -> None:
+        if not self._capturing:
+            return
 
-        logger.debug("MotionService loop exiting")
+        try:
+            self.frame_source.pause()
+        except Exception:
+            logger.exception("Failed to pause frame source")
+        self._capturing = False
+        self._pipeline.reset()
+        logger.info("Motion capture suspended")
+
+    def _resume_capture(self) -> bool:
+        try:
+            self.frame_source.resume()
+        except Exception:
+            logger.exception("Failed to resume frame source; retrying")
+            self._wake_event.wait(self.RESUME_RETRY_DELAY)
+            self._wake_event.clear()
+            return False
+
+        self._capturing = True
+        logger.info("Motion capture resumed")
+        return True
+
+    def _capture_suspended_for(self) -> float:
+        return self._sampler.capture_suspended_for() if self._sampler else 0.0
+
+    def _current_interval(self) -> float:
+        return self._sampler.interval() if self._sampler else MOTION_INTERVAL_WAKE
+
+    def _wait_for_next_frame(self):
+        self._wake_event.wait(self._current_interval())
+        self._wake_event.clear()
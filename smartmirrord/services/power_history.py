@@ -0,0 +1,255 @@
+import logging
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple
+
+from smartmirrord.config import POWER_HISTORY_PATH, POWER_HISTORY_SIZE
+
+logger = logging.getLogger(__name__)
+
+# What produced a transition: the state read at daemon startup, or a GPIO edge.
+STARTUP = 0
+EDGE = 1
+SOURCE_NAMES = {STARTUP: "startup", EDGE: "edge"}
+# File-only record: the daemon was still watching at this time.
+CHECKPOINT = 2
+
+# Record: wall-clock timestamp, state, source.
+_RECORD = struct.Struct("<dBB")
+# File header: magic, version.
+_HEADER = struct.Struct("<4sH")
+_MAGIC = b"SMPH"
+_VERSION = 1
+
+
+class PowerHistory:
+    """
+    Stabilized power transitions, bounded in memory and appended to disk.
+
+    Transitions live in parallel arrays next to running totals (seconds
+    on, seconds unobserved, dropouts, recoveries and recovery time up to
+    each record), so any window query is two bisects and a subtraction. A dropout is an edge
+    going OFF after ON; its recovery is the next edge back ON. Startup
+    reads only set the state, since the panel may have changed while the
+    daemon was down. A running daemon writes checkpoints, periodically and
+    on shutdown, so only the time between the last checkpoint and a startup
+    record counts as unobserved, neither on nor off.
+
+    Beyond ``capacity`` records the oldest quarter is dropped. Each record
+    is appended to ``path`` as it happens and reloaded on startup; the file
+    is rewritten once it holds twice ``capacity`` records, keeping only the
+    latest checkpoint.
+
+    Timestamps are wall-clock seconds, clamped so they never go backwards
+    (e.g. when NTP corrects the clock after boot).
+    """
+
+    def __init__(self, path: str = POWER_HISTORY_PATH, capacity: int = POWER_HISTORY_SIZE):
+        self.path = path
+        self.capacity = capacity
+        self._lock = threading.Lock()
+
+        self._times = array("d")
+        self._states = array("b")
+        self._sources = array("b")
+        self._on_seconds = array("d")
+        self._dropouts = array("l")
+        self._recoveries = array("l")
+        self._recovery_seconds = array("d")
+        self._unobserved_seconds = array("d")
+        # Latest checkpoint; the daemon was up from the last record until then.
+        self._alive_until = 0.0
+        self._file_records = 0
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def record(self, is_on: bool, timestamp: float, source: int) -> None:
+        with self._lock:
+            timestamp = self._append(is_on, timestamp, source)
+            self._write(is_on, timestamp, source)
+
+    def checkpoint(self, timestamp: float) -> None:
+        """Note that the daemon was still watching the panel at ``timestamp``."""
+        with self._lock:
+            if not self._times or timestamp <= self._times[-1]:
+                return
+            self._alive_until = timestamp
+            self._write(bool(self._states[-1]), timestamp, CHECKPOINT)
+
+    def summary(self, start: float, end: Optional[float] = None) -> dict:
+        """Uptime, dropouts and mean time to recover within [start, end]."""
+        with self._lock:
+            end = min(time.time() if end is None else end, time.time())
+            start = min(start, end)
+
+            on_end, unobserved_end = self._totals_at(end)
+            on_start, unobserved_start = self._totals_at(start)
+            on = on_end - on_start
+            observed = end - max(start, self._times[0]) if self._times else 0.0
+            observed -= unobserved_end - unobserved_start
+            dropouts = self._count(self._dropouts, end) - self._count(self._dropouts, start)
+            recoveries = self._count(self._recoveries, end) - self._count(self._recoveries, start)
+            recovery_time = self._count(self._recovery_seconds, end) - self._count(self._recovery_seconds, start)
+
+            return {
+                "start": start,
+                "end": end,
+                "observed_sec": round(max(observed, 0.0), 3),
+                "uptime_pct": round(100.0 * on / observed, 3) if observed > 0 else None,
+                "dropouts": dropouts,
+                "recoveries": recoveries,
+                "mttr_sec": round(recovery_time / recoveries, 3) if recoveries else None,
+            }
+
+    def transitions(self, start: float, end: float, limit: int) -> List[dict]:
+        """The latest ``limit`` transitions within [start, end], oldest first."""
+        with self._lock:
+            hi = bisect_right(self._times, end)
+            lo = max(bisect_left(self._times, start), hi - limit)
+
+            return [
+                {
+                    "time": self._times[i],
+                    "state": "ON" if self._states[i] else "OFF",
+                    "source": SOURCE_NAMES[self._sources[i]],
+                }
+                for i in range(lo, hi)
+            ]
+
+    def _totals_at(self, when: float) -> Tuple[float, float]:
+        """Running seconds-on and unobserved-seconds totals at ``when``."""
+        k = bisect_right(self._times, when) - 1
+        if k < 0:
+            if not self._times:
+                return 0.0, 0.0
+            return self._on_seconds[0], self._unobserved_seconds[0]
+
+        partial = when - self._times[k]
+        if k + 1 < len(self._times) and self._sources[k + 1] == STARTUP:
+            # Inside a gap that ended with a restart: observed up to the last
+            # checkpoint, unobserved after it.
+            gap = self._times[k + 1] - self._times[k]
+            observed = gap - (self._unobserved_seconds[k + 1] - self._unobserved_seconds[k])
+            seen = min(partial, observed)
+            on = self._on_seconds[k] + (seen if self._states[k] else 0.0)
+            return on, self._unobserved_seconds[k] + partial - seen
+        return self._on_seconds[k] + (partial if self._states[k] else 0.0), self._unobserved_seconds[k]
+
+    def _count(self, totals: array, when: float):
+        k = bisect_right(self._times, when) - 1
+        return totals[k] if k >= 0 else totals[0] if totals else 0
+
+    def _append(self, is_on: bool, timestamp: float, source: int) -> float:
+        if self._times:
+            last = len(self._times) - 1
+            timestamp = max(timestamp, self._times[last])
+            was_on = self._states[last]
+            gap = timestamp - self._times[last]
+            on_seconds = self._on_seconds[last]
+            unobserved_seconds = self._unobserved_seconds[last]
+            if source == STARTUP:
+                observed = min(max(0.0, self._alive_until - self._times[last]), gap)
+                unobserved_seconds += gap - observed
+                gap = observed
+            if was_on:
+                on_seconds += gap
+            dropouts = self._dropouts[last]
+            recoveries = self._recoveries[last]
+            recovery_seconds = self._recovery_seconds[last]
+
+            if source == EDGE and was_on and not is_on:
+                dropouts += 1
+            elif source == EDGE and is_on and not was_on and self._sources[last] == EDGE:
+                recoveries += 1
+                recovery_seconds += gap
+        else:
+            on_seconds = recovery_seconds = unobserved_seconds = 0.0
+            dropouts = recoveries = 0
+
+        self._times.append(timestamp)
+        self._states.append(1 if is_on else 0)
+        self._sources.append(source)
+        self._on_seconds.append(on_seconds)
+        self._dropouts.append(dropouts)
+        self._recoveries.append(recoveries)
+        self._recovery_seconds.append(recovery_seconds)
+        self._unobserved_seconds.append(unobserved_seconds)
+
+        # Queries only subtract running totals, so trimming needs no rebase.
+        if len(self._times) > self.capacity:
+            drop = max(1, self.capacity // 4)
+            for values in (
+                self._times, self._states, self._sources, self._on_seconds,
+                self._dropouts, self._recoveries, self._recovery_seconds,
+                self._unobserved_seconds,
+            ):
+                del values[:drop]
+
+        return timestamp
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        except OSError:
+            logger.exception("Failed to read power history from %s", self.path)
+            return
+
+        if data:
+            magic, version = _HEADER.unpack_from(data) if len(data) >= _HEADER.size else (None, None)
+            if magic != _MAGIC or version != _VERSION:
+                logger.error("%s is not a power history file; starting a new one", self.path)
+                os.replace(self.path, self.path + ".bad")
+                data = b""
+
+        count = max(0, len(data) - _HEADER.size) // _RECORD.size
+        for timestamp, state, source in _RECORD.iter_unpack(data[_HEADER.size:_HEADER.size + count * _RECORD.size]):
+            if source == CHECKPOINT:
+                self._alive_until = timestamp
+            else:
+                self._append(bool(state), timestamp, source)
+        self._file_records = count
+
+        whole = _HEADER.size + count * _RECORD.size
+        if not data or len(data) != whole or count > 2 * self.capacity:
+            # New file, a torn final record, or time to compact.
+            self._rewrite()
+
+        logger.info("Loaded %d power transitions from %s", len(self), self.path)
+
+    def _rewrite(self) -> None:
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION))
+                for i in range(len(self._times)):
+                    f.write(_RECORD.pack(self._times[i], self._states[i], self._sources[i]))
+                records = len(self._times)
+                if self._times and self._alive_until > self._times[-1]:
+                    f.write(_RECORD.pack(self._alive_until, self._states[-1], CHECKPOINT))
+                    records += 1
+            os.replace(tmp, self.path)
+            self._file_records = records
+        except OSError:
+            logger.exception("Failed to write power history to %s", self.path)
+
+    def _write(self, is_on: bool, timestamp: float, source: int) -> None:
+        if self._file_records >= 2 * self.capacity:
+            self._rewrite()
+            return
+
+        try:
+            with open(self.path, "ab") as f:
+                f.write(_RECORD.pack(timestamp, 1 if is_on else 0, source))
+            self._file_records += 1
+        except OSError:
+            logger.exception("Failed to append power history to %s", self.path)
@@ -1,7 +1,11 @@
 import threading
 import logging
+import time
 from typing import Callable, List, Optional
+from smartmirrord.config import POWER_HISTORY_CHECKPOINT_SEC
 from smartmirrord.hardware.power_status import PowerStatus
+from smartmirrord.services.power_history import EDGE, STARTUP, PowerHistory
+from smartmirrord.services.scheduler_service import ScheduledCall
 
 log = logging.getLogger(__name__)
 
@@ -9,12 +13,18 @@ log = logging.getLogger(__name__)
 class PowerService:
     STABILITY_WINDOW = 1.2  # seconds required to consider stable
 
-    def __init__(self):
+    def __init__(self, scheduler, history: Optional[PowerHistory] = None):
+        self._scheduler = scheduler
+        self.history = history
         self._on_power_on_handlers: List[Callable[[], None]] = []
         self._on_power_off_handlers: List[Callable[[], None]] = []
 
         self._is_on: bool | None = None
-        self._stability_timer: Optional[threading.Timer] = None
+        self._pending_state = False
+        self._pending_since_ns = 0
+        self._pending_source = STARTUP
+        self._stability_timer: Optional[ScheduledCall] = None
+        self._checkpoint_timer: Optional[ScheduledCall] = None
         self._lock = threading.Lock()
 
         self._running = False
@@ -37,7 +47,12 @@ class PowerService:
         initial_state = self._power_gpio.read()
         log.info("Initial power GPIO read: %s", "ON" if initial_state else "OFF")
 
-        self._start_stability_timer(initial_state)
+        self._start_stability_timer(initial_state, time.monotonic_ns(), STARTUP)
+
+        if self.history is not None and POWER_HISTORY_CHECKPOINT_SEC > 0:
+            self._checkpoint_timer = self._scheduler.call_later(
+                POWER_HISTORY_CHECKPOINT_SEC, self._checkpoint
+            )
 
     def stop(self):
         with self._lock:
@@ -51,6 +66,15 @@ class PowerService:
                 self._stability_timer = None
                 log.debug("Stability timer cancelled")
 
+            if self._checkpoint_timer:
+                self._checkpoint_timer.cancel()
+                self._checkpoint_timer = None
+            watched = self._is_on is not None
+
+        if self.history is not None and watched:
+            # Downtime is only counted from here, not from the last edge.
+            self.history.checkpoint(time.time())
+
         if self._power_gpio:
             try:
                 close = getattr(self._power_gpio, "close", None)
@@ -63,40 +87,53 @@ class PowerService:
 
         log.info("PowerService stopped")
 
-    def _start_stability_timer(self, is_on: bool):
+    def _start_stability_timer(self, is_on: bool, timestamp_ns: int, source: int):
         with self._lock:
             if not self._running:
                 return
 
-            if self._stability_timer:
-                self._stability_timer.cancel()
-                log.debug("Cancelled previous stability timer")
+            # Count the window from the edge itself, not from when it was
+            # delivered.
+            elapsed = (time.monotonic_ns() - timestamp_ns) / 1e9
+            delay = max(0.0, self.STABILITY_WINDOW - elapsed)
 
             log.debug(
-                "Starting stability timer (%.1fs) for state=%s",
-                self.STABILITY_WINDOW,
+                "Starting stability timer (%.3fs) for state=%s",
+                delay,
                 "ON" if is_on else "OFF",
             )
 
-            self._stability_timer = threading.Timer(
-                self.STABILITY_WINDOW, self._stable_callback, args=(is_on,)
-            )
-            self._stability_timer.daemon = True
-            self._stability_timer.start()
+            # A bouncing LED only pushes the deadline out; the state to
+            # settle on is read when the timer fires.
+            self._pending_state = is_on
+            self._pending_since_ns = timestamp_ns
+            self._pending_source = source
+            if self._stability_timer:
+                self._stability_timer.reschedule(delay)
+            else:
+                self._stability_timer = self._scheduler.call_later(
+                    delay, self._stable_callback
+                )
 
-    def _handle_power_change(self, is_on: bool):
+    def _handle_power_change(self, is_on: bool, timestamp_ns: int):
         with self._lock:
             if not self._running:
                 return
 
-        log.debug("GPIO edge detected: %s", "ON" if is_on else "OFF")
-        self._start_stability_timer(is_on)
+        log.debug(
+            "GPIO edge detected: %s (%.1fms ago)",
+            "ON" if is_on else "OFF",
+            (time.monotonic_ns() - timestamp_ns) / 1e6,
+        )
+        self._start_stability_timer(is_on, timestamp_ns, EDGE)
 
-    def _stable_callback(self, stable_value: bool):
+    def _stable_callback(self):
         with self._lock:
             if not self._running:
                 return
 
+            stable_value = self._pending_state
+
             if self._is_on == stable_value:
                 log.debug(
                     "Stability timer fired but state unchanged (%s)",
@@ -104,7 +141,16 @@ class PowerService:
                 )
                 return
 
+            # The first state of a run is always its startup record, even
+            # when an edge landed inside the first stability window.
+            source = STARTUP if self._is_on is None else self._pending_source
             self._is_on = stable_value
+            since_ns = self._pending_since_ns
+
+        if self.history is not None:
+            # Date the transition from its edge, not from the end of the window.
+            since = time.time() - (time.monotonic_ns() - since_ns) / 1e9
+            self.history.record(stable_value, since, source)
 
         log.info(
             "Power state stabilized: %s",
@@ -117,6 +163,16 @@ class PowerService:
         else:
             self._emit_power_off()
 
+    def _checkpoint(self):
+        with self._lock:
+            if not self._running:
+                return
+            watched = self._is_on is not None
+            self._checkpoint_timer.reschedule(POWER_HISTORY_CHECKPOINT_SEC)
+
+        if watched:
+            self.history.checkpoint(time.time())
+
     def _emit_power_on(self):
         for handler in self._on_power_on_handlers:
             try:
@@ -0,0 +1,168 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledCall:
+    """
+    Handle for a callback queued on SchedulerService.
+
+    cancel() stops it from running; reschedule() moves it to ``delay``
+    seconds from now, re-arming it if it already ran or was cancelled.
+    """
+
+    __slots__ = ("_scheduler", "fn", "args", "deadline", "_queued_at", "_version", "cancelled", "done")
+
+    def __init__(self, scheduler: "SchedulerService", fn: Callable, args: tuple):
+        self._scheduler = scheduler
+        self.fn = fn
+        self.args = args
+        self.deadline = 0.0
+        # Deadline of this handle's live heap entry, None when not queued.
+        self._queued_at: Optional[float] = None
+        self._version = 0
+        self.cancelled = False
+        self.done = False
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled and not self.done
+
+    def cancel(self) -> None:
+        self._scheduler._cancel(self)
+
+    def reschedule(self, delay: float) -> None:
+        self._scheduler._reschedule(self, delay)
+
+
+class SchedulerService:
+    """
+    One thread running every delayed callback in the daemon.
+
+    Calls sit in a heap ordered by monotonic deadline and the thread sleeps
+    on a condition until the earliest is due, so scheduling costs no thread
+    creation. Cancelled or moved calls leave their old heap entry behind and
+    it is skipped when popped. Pushing a deadline later, as the remute and
+    power stability timers do on every event, only updates the handle: the
+    existing entry is re-queued at the new deadline when it comes up.
+
+    Callbacks run on the scheduler thread and must not block.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self.scheduled = 0
+        self.fired = 0
+        self.cancelled = 0
+
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+        self._thread.start()
+        logger.info("SchedulerService started")
+
+    def stop(self) -> None:
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify()
+
+        self._thread.join()
+        self._thread = None
+        logger.info("SchedulerService stopped")
+
+    def call_later(self, delay: float, fn: Callable, *args) -> ScheduledCall:
+        call = ScheduledCall(self, fn, args)
+        self._reschedule(call, delay)
+        return call
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "scheduled": self.scheduled,
+                "fired": self.fired,
+                "cancelled": self.cancelled,
+                "heap_entries": len(self._heap),
+            }
+
+    def _push(self, call: ScheduledCall) -> None:
+        call._version += 1
+        call._queued_at = call.deadline
+        heapq.heappush(self._heap, (call.deadline, next(self._seq), call._version, call))
+
+    def _reschedule(self, call: ScheduledCall, delay: float) -> None:
+        deadline = time.monotonic() + delay
+        with self._cond:
+            self.scheduled += 1
+            call.deadline = deadline
+            call.cancelled = False
+            call.done = False
+
+            if call._queued_at is not None and deadline >= call._queued_at:
+                # Later than the queued entry: it re-queues itself when popped.
+                return
+
+            self._push(call)
+            if self._heap[0][3] is call:
+                self._cond.notify()
+
+    def _cancel(self, call: ScheduledCall) -> None:
+        with self._cond:
+            if call.active:
+                self.cancelled += 1
+            call.cancelled = True
+            call._queued_at = None
+            call._version += 1
+
+    def _next_due(self) -> Optional[ScheduledCall]:
+        """Pop the next due call, or wait; returns None when stopping."""
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                deadline, _, version, call = self._heap[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+
+                heapq.heappop(self._heap)
+                if version != call._version or call.cancelled:
+                    continue
+                if call.deadline > deadline:
+                    self._push(call)
+                    continue
+
+                call._queued_at = None
+                call.done = True
+                self.fired += 1
+                return call
+
+        return None
+
+    def _run(self) -> None:
+        while True:
+            call = self._next_due()
+            if call is None:
+                break
+            try:
+                call.fn(*call.args)
+            except Exception:
+                logger.exception("Scheduled callback failed (%s)", getattr(call.fn, "__qualname__", call.fn))
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Union
+
+from smartmirrord.config import UART_ACK_TIMEOUT
+from smartmirrord.services.scheduler_service import ScheduledCall
+
+logger = logging.getLogger(__name__)
+
+Matcher = Union[str, Callable[[str], bool]]
+
+
+class _Pending:
+    __slots__ = ("kind", "matcher", "future", "sent_at", "timer")
+
+    def __init__(self, kind: str, matcher: Callable[[str], bool], future: Future):
+        self.kind = kind
+        self.matcher = matcher
+        self.future = future
+        self.sent_at = 0.0
+        self.timer: Optional[ScheduledCall] = None
+
+
+class _AckStats:
+    __slots__ = ("acks", "timeouts", "total", "min", "max", "last")
+
+    def __init__(self):
+        self.acks = 0
+        self.timeouts = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, latency: float) -> None:
+        self.acks += 1
+        self.total += latency
+        self.min = min(self.min, latency)
+        self.max = max(self.max, latency)
+        self.last = latency
+
+    def as_dict(self) -> dict:
+        def ms(seconds):
+            return round(seconds * 1e3, 2)
+
+        return {
+            "acks": self.acks,
+            "timeouts": self.timeouts,
+            "mean_ms": ms(self.total / self.acks) if self.acks else None,
+            "min_ms": ms(self.min) if self.acks else None,
+            "max_ms": ms(self.max) if self.acks else None,
+            "last_ms": ms(self.last) if self.acks else None,
+        }
+
+
+class UartCorrelator:
+    """
+    Pairs UART commands with the line that acknowledges them.
+
+    request() writes a command and returns a Future that resolves with the
+    first matching line, or fails with TimeoutError. A line settles at most
+    one request, the oldest one it matches. Command-to-acknowledgement
+    latency is kept per command kind.
+
+    Registered with UartDispatcher as a can_handle() handler so it sees every
+    line, but only while requests are outstanding.
+    """
+
+    def __init__(self, dispatcher, uart, scheduler):
+        self._dispatcher = dispatcher
+        self._uart = uart
+        self._scheduler = scheduler
+        self._pending: List[_Pending] = []
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _AckStats] = {}
+        self._running = False
+
+    def start(self) -> None:
+        if self._running:
+            return
+
+        self._dispatcher.register_handler(self)
+        self._running = True
+        logger.info("UartCorrelator started")
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+
+        self._running = False
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for request in pending:
+            if request.timer:
+                request.timer.cancel()
+            request.future.cancel()
+
+        logger.info("UartCorrelator stopped")
+
+    def request(
+        self,
+        command: str,
+        expect: Matcher,
+        timeout: float = UART_ACK_TIMEOUT,
+        kind: Optional[str] = None,
+    ) -> Future:
+        """
+        Write ``command`` and wait for a line matching ``expect``, either an
+        exact line or a predicate. ``kind`` groups latency stats and
+        defaults to the command itself.
+        """
+        if not self._running:
+            raise RuntimeError("UartCorrelator is not running")
+
+        matcher = expect if callable(expect) else expect.__eq__
+        request = _Pending(kind or command, matcher, Future())
+        request.future.set_running_or_notify_cancel()
+
+        # Listen before writing so a fast answer can't slip past.
+        with self._lock:
+            self._pending.append(request)
+
+        request.sent_at = time.monotonic()
+        try:
+            self._uart.write(command)
+        except Exception as e:
+            self._settle(request)
+            request.future.set_exception(e)
+            return request.future
+
+        timer = self._scheduler.call_later(timeout, self._on_timeout, request)
+        with self._lock:
+            if request in self._pending:
+                request.timer = timer
+                return request.future
+        # Acknowledged before the timer existed.
+        timer.cancel()
+        return request.future
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {kind: stats.as_dict() for kind, stats in self._stats.items()}
+
+    def can_handle(self, line: str) -> bool:
+        return bool(self._pending)
+
+    def handle(self, line: str) -> None:
+        now = time.monotonic()
+
+        with self._lock:
+            for request in self._pending:
+                if request.matcher(line):
+                    self._pending.remove(request)
+                    break
+            else:
+                return
+            self._kind_stats(request.kind).record(now - request.sent_at)
+
+        if request.timer:
+            request.timer.cancel()
+        logger.debug(
+            "UART ack for %s after %.1fms: %s",
+            request.kind,
+            (now - request.sent_at) * 1e3,
+            line,
+        )
+        request.future.set_result(line)
+
+    def _on_timeout(self, request: _Pending) -> None:
+        if not self._settle(request):
+            return
+
+        with self._lock:
+            self._kind_stats(request.kind).timeouts += 1
+
+        logger.warning("No UART ack for %s", request.kind)
+        request.future.set_exception(TimeoutError(f"No UART ack for {request.kind}"))
+
+    def _settle(self, request: _Pending) -> bool:
+        with self._lock:
+            if request not in self._pending:
+                return False
+            self._pending.remove(request)
+        if request.timer:
+            request.timer.cancel()
+        return True
+
+    def _kind_stats(self, kind: str) -> _AckStats:
+        stats = self._stats.get(kind)
+        if stats is None:
+            stats = self._stats[kind] = _AckStats()
+        return stats
@@ -1,23 +1,119 @@
 import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+class _PrefixNode:
+    __slots__ = ("children", "handlers")
+
+    def __init__(self):
+        self.children: Dict[str, "_PrefixNode"] = {}
+        self.handlers: List[object] = []
+
+
+class _HandlerStats:
+    __slots__ = ("name", "matched", "dispatched", "errors")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.matched = 0
+        self.dispatched = 0
+        self.errors = 0
+
+
 class UartDispatcher:
+    """
+    Routes UART lines to the handlers interested in them.
+
+    Handlers declare what they want either as ``uart_lines`` / ``uart_prefixes``
+    attributes or through register_handler(). Exact lines are looked up in a
+    dict and prefixes by walking a character trie, so routing a line costs
+    one lookup plus the length of the longest matching prefix, no matter how
+    many handlers are registered. Handlers that declare neither fall back to
+    having can_handle() asked for every line.
+
+    Registration builds new routing tables and swaps them in under a lock,
+    so the dispatch thread always reads a complete set without locking.
+    """
+
     def __init__(self, transport):
-        self._handlers = []
         self._transport = transport
         self._running = False
 
-    def register_handler(self, handler) -> None:
+        self._exact: Dict[str, Tuple[object, ...]] = {}
+        self._prefixes = _PrefixNode()
+        self._legacy = ()
+        self._routes: List[Tuple[object, tuple, tuple]] = []
+        self._stats: Dict[int, _HandlerStats] = {}
+        self._register_lock = threading.Lock()
+
+        self.lines = 0
+        self.unmatched = 0
+
+    def register_handler(
+        self,
+        handler,
+        lines: Optional[Iterable[str]] = None,
+        prefixes: Optional[Iterable[str]] = None,
+        name: Optional[str] = None,
+    ) -> None:
         """
         Register a handler.
 
         Handler must implement:
-          - can_handle(line: str) -> bool
           - handle(line: str) -> None
+        and should declare the lines it wants, as arguments here or as
+        ``uart_lines`` / ``uart_prefixes`` attributes. Without either it must
+        implement can_handle(line: str) -> bool, which is then called for
+        every line.
+
+        Stats are reported under ``name``, the handler's ``uart_name``
+        attribute or its class name, with a ``#2``, ``#3``... suffix when
+        another handler already uses it.
         """
-        self._handlers.append(handler)
+        if lines is None:
+            lines = getattr(handler, "uart_lines", None)
+        if prefixes is None:
+            prefixes = getattr(handler, "uart_prefixes", None)
+        if name is None:
+            name = getattr(handler, "uart_name", None) or handler.__class__.__name__
+
+        with self._register_lock:
+            taken = {stats.name for key, stats in self._stats.items() if key != id(handler)}
+            unique, n = name, 1
+            while unique in taken:
+                n += 1
+                unique = f"{name}#{n}"
+
+            stats = dict(self._stats)
+            stats[id(handler)] = _HandlerStats(unique)
+            self._stats = stats
+
+            if lines is None and prefixes is None:
+                self._legacy = self._legacy + (handler,)
+                return
+
+            self._routes.append((handler, tuple(lines or ()), tuple(prefixes or ())))
+            self._exact, self._prefixes = self._build_routes(self._routes)
+
+    @staticmethod
+    def _build_routes(routes) -> Tuple[Dict[str, Tuple[object, ...]], _PrefixNode]:
+        exact: Dict[str, List[object]] = {}
+        root = _PrefixNode()
+
+        for handler, lines, prefixes in routes:
+            for line in lines:
+                exact.setdefault(line, []).append(handler)
+
+            for prefix in prefixes:
+                node = root
+                for char in prefix:
+                    node = node.children.setdefault(char, _PrefixNode())
+                node.handlers.append(handler)
+
+        return {line: tuple(handlers) for line, handlers in exact.items()}, root
 
     def start(self):
         if self._running:
@@ -34,17 +130,66 @@ class UartDispatcher:
         self._running = False
         logger.info("UartDispatcher stopped")
 
+    def stats(self) -> dict:
+        return {
+            "lines": self.lines,
+            "unmatched": self.unmatched,
+            "handlers": {
+                stats.name: {
+                    "matched": stats.matched,
+                    "dispatched": stats.dispatched,
+                    "errors": stats.errors,
+                }
+                for stats in self._stats.values()
+            },
+        }
+
+    def _match(self, line: str) -> List[object]:
+        # Registration replaces these tables rather than editing them.
+        matched = list(self._exact.get(line, ()))
+
+        node = self._prefixes
+        for char in line:
+            node = node.children.get(char)
+            if node is None:
+                break
+            for handler in node.handlers:
+                if handler not in matched:
+                    matched.append(handler)
+
+        for handler in self._legacy:
+            try:
+                if handler.can_handle(line):
+                    matched.append(handler)
+            except Exception:
+                self._stats[id(handler)].errors += 1
+                logger.exception(
+                    "UART handler error (%s)",
+                    handler.__class__.__name__,
+                )
+
+        return matched
+
     def _on_line(self, line: str) -> None:
         if not self._running:
             return
 
         logger.debug("Dispatcher RX: %s", line)
 
-        for handler in self._handlers:
+        self.lines += 1
+        handlers = self._match(line)
+        if not handlers:
+            self.unmatched += 1
+            return
+
+        for handler in handlers:
+            stats = self._stats[id(handler)]
+            stats.matched += 1
             try:
-                if handler.can_handle(line):
-                    handler.handle(line)
+                handler.handle(line)
+                stats.dispatched += 1
             except Exception:
+                stats.errors += 1
                 logger.exception(
                     "UART handler error (%s)",
                     handler.__class__.__name__,
@@ -1,16 +1,24 @@
 import logging
 import threading
+from concurrent.futures import Future
+from functools import partial
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
 class VideoMuteService:
-    TRANSITION_TIMEOUT = 8
-
-    def __init__(self, dispatcher, uart, power_service):
+    # Routed by UartDispatcher without calling can_handle().
+    uart_lines = (
+        "Video Mute on",
+        "Video Mute off",
+        "PORT_SW_INVERTER on",
+        "PORT_SW_INVERTER off",
+    )
+
+    def __init__(self, dispatcher, correlator, power_service):
         self._dispatcher = dispatcher
-        self._uart = uart
+        self._correlator = correlator
         self._power_service = power_service
 
         self._panel_muted: Optional[bool] = None
@@ -20,7 +28,8 @@ class VideoMuteService:
         self._power_on = False
         self._transition_active = False
         self._converged_event = threading.Event()
-        self._transition_timer: Optional[threading.Timer] = None
+        # Bumped per transition so late acks from an older one are ignored.
+        self._transition_id = 0
         self._running = False
 
         logger.info("VideoMuteService constructed")
@@ -41,10 +50,7 @@ class VideoMuteService:
             return
 
         self._running = False
-
-        if self._transition_timer:
-            self._transition_timer.cancel()
-            self._transition_timer = None
+        self._transition_id += 1
 
         self._transition_active = False
         self._desired_muted = None
@@ -107,41 +113,40 @@ class VideoMuteService:
 
     def _start_transition(self) -> None:
         self._transition_active = True
+        self._transition_id += 1
         self._converged_event.clear()
 
-        if self._transition_timer:
-            self._transition_timer.cancel()
-
-        self._transition_timer = threading.Timer(
-            self.TRANSITION_TIMEOUT,
-            self._on_transition_timeout,
-        )
-        self._transition_timer.daemon = True
-        self._transition_timer.start()
-
         logger.debug("Transition started (desired_muted=%s)", self._desired_muted)
 
     def _complete_transition(self) -> None:
         self._transition_active = False
         self._converged_event.set()
 
-        if self._transition_timer:
-            self._transition_timer.cancel()
-            self._transition_timer = None
-
         logger.info(
             "VideoMute converged: panel_muted=%s backlight_on=%s",
             self._panel_muted,
             self._backlight_on,
         )
 
-    def _on_transition_timeout(self) -> None:
-        if not self._running:
+    def _send(self, command: str, ack: str) -> None:
+        future = self._correlator.request(command, ack)
+        future.add_done_callback(partial(self._on_ack, self._transition_id, command))
+
+    def _on_ack(self, transition_id: int, command: str, future: Future) -> None:
+        if future.cancelled() or future.exception() is None:
+            # Acknowledged; handle() has already applied the state line.
+            return
+
+        if not self._running or transition_id != self._transition_id:
+            return
+        if not self._transition_active:
             return
 
         logger.error(
-            "VideoMute transition timeout "
+            "VideoMute transition failed: %s (%s) "
             "(desired_muted=%s panel_muted=%s backlight_on=%s)",
+            command,
+            future.exception(),
             self._desired_muted,
             self._panel_muted,
             self._backlight_on,
@@ -158,8 +163,8 @@ class VideoMuteService:
             self._backlight_on,
         )
 
-        self._uart.write("videomute 1 1")  # backlight off
-        self._uart.write("videomute 0 1")  # panel black
+        self._send("videomute 1 1", "PORT_SW_INVERTER off")  # backlight off
+        self._send("videomute 0 1", "Video Mute on")  # panel black
 
     def _apply_unmute_sequence(self) -> None:
         logger.debug(
@@ -168,8 +173,8 @@ class VideoMuteService:
             self._backlight_on,
         )
 
-        self._uart.write("videomute 0 0")  # panel active
-        self._uart.write("videomute 1 0")  # backlight on
+        self._send("videomute 0 0", "Video Mute off")  # panel active
+        self._send("videomute 1 0", "PORT_SW_INVERTER on")  # backlight on
 
     def can_handle(self, line: str) -> bool:
         return (
@@ -230,10 +235,7 @@ class VideoMuteService:
         self._panel_muted = None
         self._backlight_on = None
         self._transition_active = False
+        self._transition_id += 1
         self._desired_muted = None
 
-        if self._transition_timer:
-            self._transition_timer.cancel()
-            self._transition_timer = None
-
         self._converged_event.clear()
@@ -0,0 +1,210 @@
+"""
+Measure IR transmit timing fidelity without a logic analyzer.
+
+    python -m smartmirrord.tools.ir_bench [--strategy spin hybrid] [--load-threads 2 --load gil]
+
+Every command in CODES is sent through IREmulator into a RecordingLineRequest
+instead of the GPIO line. For each wait strategy the report gives the
+distribution of pulse duration errors against the ir_timing constants, the
+fraction of frames a software NEC decoder with standard tolerances decodes
+back to the right code, and CPU time per command, optionally while
+background threads load the CPU.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from smartmirrord.hardware.fake_gpio import RecordingLineRequest
+from smartmirrord.hardware.ir_codes import CODES, SAMSUNG_PREFIX
+from smartmirrord.hardware.ir_emulator import IREmulator, WAIT_SPIN, WAIT_HYBRID
+from smartmirrord.hardware.ir_timing import (
+    LEADER_LOW, LEADER_HIGH,
+    BIT_LOW, BIT_HIGH_0, BIT_HIGH_1,
+    STOP_LOW,
+)
+
+# Receivers commonly accept pulses within 25% of nominal.
+DEFAULT_TOLERANCE = 0.25
+
+LOAD_GIL = "gil"
+LOAD_NATIVE = "native"
+
+
+def _within(duration: float, nominal: int, tolerance: float) -> bool:
+    return abs(duration - nominal) <= nominal * tolerance
+
+
+def decode_nec(pulses, tolerance: float = DEFAULT_TOLERANCE):
+    """
+    Decode ``(level, duration_us)`` pulses into a 32-bit code, or None.
+
+    Mirrors what a receiver does: the leader and every mark must be within
+    tolerance of nominal, and each space is classified as a 0 or 1 bit.
+    """
+    if len(pulses) < 67:
+        return None
+
+    if not (_within(pulses[0][1], LEADER_LOW, tolerance)
+            and _within(pulses[1][1], LEADER_HIGH, tolerance)):
+        return None
+
+    code = 0
+    for i in range(32):
+        mark = pulses[2 + 2 * i][1]
+        space = pulses[3 + 2 * i][1]
+        if not _within(mark, BIT_LOW, tolerance):
+            return None
+        if _within(space, BIT_HIGH_1, tolerance):
+            code = (code << 1) | 1
+        elif _within(space, BIT_HIGH_0, tolerance):
+            code <<= 1
+        else:
+            return None
+
+    if not _within(pulses[66][1], STOP_LOW, tolerance):
+        return None
+    return code
+
+
+def _percentile(ordered, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _load_worker(kind: str, stop: threading.Event) -> None:
+    if kind == LOAD_NATIVE:
+        # hashlib drops the GIL on large buffers: CPU contention only.
+        data = bytes(1 << 20)
+        while not stop.is_set():
+            hashlib.sha256(data).digest()
+    else:
+        # Pure Python holds the GIL between switch intervals.
+        while not stop.is_set():
+            sum(i * i for i in range(10_000))
+
+
+def run_strategy(strategy: str, rounds: int, tolerance: float) -> dict:
+    recorder = RecordingLineRequest()
+    emulator = IREmulator(repeats=1, wait_strategy=strategy, policies={}, line_request=recorder)
+    emulator.start()
+
+    errors = []
+    decoded = 0
+    frames = 0
+
+    try:
+        for _ in range(rounds):
+            for command, value in CODES.items():
+                recorder.clear()
+                emulator.send(command)
+
+                expected = emulator.generate_pulses(value)
+                measured = recorder.pulses()
+                errors.extend(
+                    abs(got - nominal)
+                    for (_, got), (_, nominal) in zip(measured, expected)
+                )
+
+                frames += 1
+                if decode_nec(measured, tolerance) == (SAMSUNG_PREFIX << 16) | value:
+                    decoded += 1
+    finally:
+        emulator.stop()
+
+    errors.sort()
+    stats = emulator.timing_stats.as_dict()
+
+    return {
+        "strategy": strategy,
+        "sleep_margin_us": round(emulator.sleep_margin * 1e6, 1),
+        "frames": frames,
+        "decode_rate": round(decoded / frames, 4) if frames else 0.0,
+        "pulse_error_us": {
+            "mean": round(sum(errors) / len(errors), 1) if errors else 0.0,
+            "p50": round(_percentile(errors, 0.50), 1),
+            "p90": round(_percentile(errors, 0.90), 1),
+            "p99": round(_percentile(errors, 0.99), 1),
+            "max": round(errors[-1], 1) if errors else 0.0,
+        },
+        "late_frames": stats["late_frames"],
+        "overrun_frames": stats["overrun_frames"],
+        "mean_cpu_ms": stats["mean_cpu_ms"],
+    }
+
+
+def bench(strategies, rounds: int, load_threads: int, load: str, tolerance: float) -> dict:
+    results = []
+
+    for strategy in strategies:
+        stop = threading.Event()
+        workers = [
+            threading.Thread(target=_load_worker, args=(load, stop), daemon=True)
+            for _ in range(load_threads)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            results.append(run_strategy(strategy, rounds, tolerance))
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+    return {
+        "load_threads": load_threads,
+        "load": load if load_threads else None,
+        "tolerance": tolerance,
+        "results": results,
+    }
+
+
+def print_report(report: dict) -> None:
+    load = f"{report['load_threads']} x {report['load']}" if report["load_threads"] else "none"
+    print(f"Background load: {load}   decoder tolerance: {report['tolerance']:.0%}")
+    for result in report["results"]:
+        error = result["pulse_error_us"]
+        print(f"[{result['strategy']}] margin {result['sleep_margin_us']}us")
+        print(
+            f"  frames {result['frames']}  decoded {result['decode_rate']:.2%}  "
+            f"late {result['late_frames']}  overrun {result['overrun_frames']}"
+        )
+        print(
+            f"  pulse error us: mean {error['mean']}  p50 {error['p50']}  "
+            f"p90 {error['p90']}  p99 {error['p99']}  max {error['max']}"
+        )
+        print(f"  CPU per command: {result['mean_cpu_ms']} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--strategy", nargs="+", default=[WAIT_SPIN, WAIT_HYBRID],
+                        choices=(WAIT_SPIN, WAIT_HYBRID))
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="times every command is sent per strategy")
+    parser.add_argument("--load-threads", type=int, default=0)
+    parser.add_argument("--load", default=LOAD_GIL, choices=(LOAD_GIL, LOAD_NATIVE),
+                        help="gil: pure-Python busy loops; native: GIL-free hashing")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="decoder pulse tolerance as a fraction of nominal")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    started = time.perf_counter()
+    report = bench(args.strategy, args.rounds, args.load_threads, args.load, args.tolerance)
+    report["elapsed_sec"] = round(time.perf_counter() - started, 2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Simulate the Samsung BN94 mainboard's debug UART on a pseudo-terminal.
+
+    python -m smartmirrord.tools.mainboard_sim serve [--noise-bps 11520]
+    python -m smartmirrord.tools.mainboard_sim bench [--cycles 20] [--noise-bps 11520]
+
+``serve`` prints the PTY path to use as UART_PORT and answers videomute
+commands until interrupted. ``bench`` runs the real UartTransport,
+UartDispatcher, UartCorrelator and VideoMuteService against the simulator
+and reports mute/unmute convergence latency and reader throughput while
+background log noise streams at the given rate (default: full baud).
+"""
+import argparse
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+import tty
+
+from smartmirrord.config import UART_BAUDRATE
+from smartmirrord.hardware.uart_framing import LineFramer
+
+logger = logging.getLogger(__name__)
+
+NOISE_PREFIXES = ("[MI]", "[HAL]", "[PNL]", "[AUD]", "[TSP]")
+
+
+class MainboardSimulator:
+    """
+    Pseudo-terminal that behaves like the mainboard's debug console.
+
+    ``videomute 0 <b>`` answers ``Video Mute on/off`` after ``mute_delay``
+    seconds and ``videomute 1 <b>`` answers ``PORT_SW_INVERTER off/on``
+    after ``backlight_delay``. With ``noise_bps`` set, random log lines are
+    streamed at that many bytes per second alongside the answers.
+    """
+
+    def __init__(
+        self,
+        mute_delay: float = 0.03,
+        backlight_delay: float = 0.05,
+        noise_bps: float = 0.0,
+        seed: int = 0,
+    ):
+        self.mute_delay = mute_delay
+        self.backlight_delay = backlight_delay
+        self.noise_bps = noise_bps
+
+        self._random = random.Random(seed)
+        self._master = None
+        self._slave = None
+        self.port = None
+
+        self._framer = LineFramer(4096)
+        self._write_lock = threading.Lock()
+        self._replies = []
+        self._reply_seq = itertools.count()
+        self._reply_cond = threading.Condition()
+
+        self._running = False
+        self._threads = []
+
+        self.commands = 0
+        self.noise_lines = 0
+        self.noise_bytes = 0
+
+    def start(self) -> None:
+        if self._running:
+            return
+
+        self._master, self._slave = os.openpty()
+        # No echo or line editing, or the board would read back its own output.
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+
+        self._running = True
+        targets = [self._command_loop, self._reply_loop]
+        if self.noise_bps > 0:
+            targets.append(self._noise_loop)
+        self._threads = [
+            threading.Thread(target=target, name=f"mainboard-sim-{target.__name__}", daemon=True)
+            for target in targets
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        logger.info("Mainboard simulator on %s", self.port)
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+
+        self._running = False
+        with self._reply_cond:
+            self._reply_cond.notify_all()
+        # Closing the slave makes the master read fail, ending the command loop.
+        os.close(self._slave)
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        os.close(self._master)
+        self._threads = []
+
+    def _write(self, data: bytes) -> None:
+        with self._write_lock:
+            os.write(self._master, data)
+
+    def _command_loop(self) -> None:
+        while self._running:
+            try:
+                data = os.read(self._master, 1024)
+            except OSError:
+                return
+            if not data:
+                return
+            for line in self._framer.feed(data):
+                self._on_command(line)
+
+    def _on_command(self, line: str) -> None:
+        parts = line.split()
+        if (
+            len(parts) != 3
+            or parts[0] != "videomute"
+            or parts[1] not in ("0", "1")
+            or parts[2] not in ("0", "1")
+        ):
+            self._reply(0.0, f"Unknown command: {line}")
+            return
+
+        self.commands += 1
+        on = parts[2] == "1"
+        if parts[1] == "0":
+            self._reply(self.mute_delay, "Video Mute on" if on else "Video Mute off")
+        else:
+            # videomute 1 1 mutes the backlight, i.e. turns the inverter off.
+            self._reply(self.backlight_delay, "PORT_SW_INVERTER off" if on else "PORT_SW_INVERTER on")
+
+    def _reply(self, delay: float, line: str) -> None:
+        with self._reply_cond:
+            heapq.heappush(self._replies, (time.monotonic() + delay, next(self._reply_seq), line))
+            self._reply_cond.notify()
+
+    def _reply_loop(self) -> None:
+        with self._reply_cond:
+            while self._running:
+                if not self._replies:
+                    self._reply_cond.wait()
+                    continue
+
+                due, _, line = self._replies[0]
+                remaining = due - time.monotonic()
+                if remaining > 0:
+                    self._reply_cond.wait(remaining)
+                    continue
+
+                heapq.heappop(self._replies)
+                self._write(f"{line}\r\n".encode())
+
+    def _noise_line(self) -> bytes:
+        rand = self._random
+        text = "".join(rand.choice("abcdefghijklmnopqrstuvwxyz_ =0123456789") for _ in range(rand.randint(20, 120)))
+        return f"{rand.choice(NOISE_PREFIXES)} {time.monotonic():.6f} {text}\r\n".encode()
+
+    def _noise_loop(self) -> None:
+        started = time.monotonic()
+        while self._running:
+            line = self._noise_line()
+            try:
+                self._write(line)
+            except OSError:
+                return
+            self.noise_lines += 1
+            self.noise_bytes += len(line)
+
+            # Pace to noise_bps, the way the UART's line rate would.
+            ahead = started + self.noise_bytes / self.noise_bps - time.monotonic()
+            if ahead > 0:
+                time.sleep(ahead)
+
+
+class _AlwaysOnPower:
+    def register_on_power_on(self, callback):
+        pass
+
+    def register_on_power_off(self, callback):
+        pass
+
+
+def _percentile(ordered, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def bench(sim: MainboardSimulator, cycles: int, timeout: float) -> dict:
+    from smartmirrord.hardware.uart_transport import UartTransport
+    from smartmirrord.services.uart_correlator import UartCorrelator
+    from smartmirrord.services.scheduler_service import SchedulerService
+    from smartmirrord.services.uart_dispatcher import UartDispatcher
+    from smartmirrord.services.videomute_service import VideoMuteService
+
+    scheduler = SchedulerService()
+    uart = UartTransport(port=sim.port)
+    dispatcher = UartDispatcher(uart)
+    correlator = UartCorrelator(dispatcher, uart, scheduler)
+    videomute = VideoMuteService(dispatcher, correlator, _AlwaysOnPower())
+    services = (scheduler, uart, dispatcher, correlator, videomute)
+
+    latencies = {"mute": [], "unmute": []}
+    failures = 0
+
+    for service in services:
+        service.start()
+    videomute.on_power_on()
+
+    started = time.perf_counter()
+    try:
+        for _ in range(cycles):
+            for name, action in (("mute", videomute.mute), ("unmute", videomute.unmute)):
+                t0 = time.perf_counter()
+                action()
+                converged = videomute.wait_for_convergence(timeout)
+                ok = (videomute.is_muted() if name == "mute" else not videomute.is_muted())
+                if converged and ok:
+                    latencies[name].append((time.perf_counter() - t0) * 1e3)
+                else:
+                    failures += 1
+    finally:
+        elapsed = time.perf_counter() - started
+        for service in reversed(services):
+            service.stop()
+
+    framing = uart.stats()
+    report = {
+        "cycles": cycles,
+        "failures": failures,
+        "noise_bps": sim.noise_bps,
+        "elapsed_sec": round(elapsed, 3),
+        "reader": {
+            "lines_per_sec": round(framing["lines"] / elapsed) if elapsed > 0 else 0,
+            "lines": framing["lines"],
+            "noise_lines_sent": sim.noise_lines,
+            "reads": framing["reads"],
+            "overflows": framing["overflows"],
+            "queue_high_water": framing["queue"]["high_water"],
+            "dropped": framing["queue"]["dropped"],
+        },
+        "acks": correlator.stats(),
+    }
+    for name, values in latencies.items():
+        values.sort()
+        report[f"{name}_ms"] = {
+            "p50": round(_percentile(values, 0.5), 2),
+            "p90": round(_percentile(values, 0.9), 2),
+            "max": round(values[-1], 2) if values else 0.0,
+        }
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['cycles']} mute/unmute cycles in {report['elapsed_sec']}s, "
+        f"{report['failures']} failed, noise {report['noise_bps']:.0f} B/s"
+    )
+    for name in ("mute", "unmute"):
+        ms = report[f"{name}_ms"]
+        print(f"  {name:<7} convergence ms: p50 {ms['p50']}  p90 {ms['p90']}  max {ms['max']}")
+    reader = report["reader"]
+    print(
+        f"  reader: {reader['lines_per_sec']} lines/s, {reader['lines']} lines "
+        f"({reader['noise_lines_sent']} noise sent) in {reader['reads']} reads, "
+        f"{reader['overflows']} overflows"
+    )
+    print(f"  dispatch queue: high water {reader['queue_high_water']}, {reader['dropped']} dropped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("mode", choices=("serve", "bench"))
+    parser.add_argument("--mute-delay", type=float, default=0.03,
+                        help="seconds before answering a panel videomute")
+    parser.add_argument("--backlight-delay", type=float, default=0.05,
+                        help="seconds before answering a backlight videomute")
+    parser.add_argument("--noise-bps", type=float, default=None,
+                        help="background log bytes/s (default: full baud in bench, none in serve)")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=5.0,
+                        help="seconds to wait for each convergence in bench mode")
+    parser.add_argument("--json", action="store_true", help="print the bench report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    noise = args.noise_bps
+    if noise is None:
+        # 8N1 framing: ten bit times per byte.
+        noise = UART_BAUDRATE / 10 if args.mode == "bench" else 0.0
+
+    sim = MainboardSimulator(args.mute_delay, args.backlight_delay, noise)
+    sim.start()
+    try:
+        if args.mode == "serve":
+            print(f"UART_PORT={sim.port}", flush=True)
+            threading.Event().wait()
+        else:
+            report = bench(sim, args.cycles, args.timeout)
+            if args.json:
+                print(json.dumps(report, indent=2))
+            else:
+                print_report(report)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+
+
+if __name__ == "__main__":
+    main()
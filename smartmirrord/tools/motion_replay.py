@@ -0,0 +1,132 @@
+"""
+Replay recorded footage through the motion detector as fast as possible.
+
+    python -m smartmirrord.tools.motion_replay PATH [--fps 20] [--detector background]
+
+PATH may be a directory of PNGs, a .npy/.npz frame stack or a video file.
+Frames go through the same MotionService.process_frame() the daemon runs,
+with source timestamps driving the cooldown, and the report lists
+throughput, per-stage timings and the timestamps of emitted motion events.
+"""
+import argparse
+import json
+import logging
+import time
+
+from smartmirrord.config import (
+    MOTION_DETECTOR,
+    MOTION_ZONE_ROWS,
+    MOTION_ZONE_COLS,
+    MOTION_ZONE_THRESHOLDS,
+    MOTION_IGNORE_ZONES,
+    MOTION_MASK_PATH,
+)
+from smartmirrord.hardware.frame_sources import DEFAULT_FPS, open_frame_source
+from smartmirrord.services.motion_pipeline import MotionPipeline
+from smartmirrord.services.motion_service import MotionService
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def replay(source, pipeline) -> dict:
+    service = MotionService(frame_source=source, pipeline=pipeline, use_process=False)
+    events = []
+
+    read_ns = 0
+    frames = 0
+
+    source.start()
+    service.reset_detection()
+    started = time.perf_counter()
+    try:
+        while True:
+            t0 = time.perf_counter_ns()
+            frame = source.read_frame()
+            read_ns += time.perf_counter_ns() - t0
+
+            if frame is None:
+                if source.is_exhausted():
+                    break
+                continue
+
+            frames += 1
+            if service.process_frame(frame, source.timestamp):
+                events.append({
+                    "frame": frames - 1,
+                    "timestamp": round(source.timestamp, 3),
+                    "score": pipeline.last_score,
+                })
+    finally:
+        source.stop()
+    elapsed = time.perf_counter() - started
+
+    def per_frame(ns):
+        return round(ns / frames / 1e6, 4) if frames else 0.0
+
+    stages = {"read": per_frame(read_ns)}
+    stages.update({name: per_frame(ns) for name, ns in pipeline.stage_ns.items()})
+
+    return {
+        "frames": frames,
+        "elapsed_sec": round(elapsed, 3),
+        "fps": round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+        "stage_ms_per_frame": stages,
+        "allocations": pipeline.stats(),
+        "zones": pipeline.zone_report(),
+        "events": events,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"Frames:  {report['frames']} in {report['elapsed_sec']}s ({report['fps']} fps)")
+    print("Per-stage ms/frame:")
+    for name, ms in report["stage_ms_per_frame"].items():
+        print(f"  {name:<10} {ms:.4f}")
+    print(
+        "Allocations: %(total_allocations)d total, %(last_frame_allocations)d on last frame"
+        % report["allocations"]
+    )
+    print(f"Zone peaks: {report['zones']['peaks']}")
+    print(f"Motion events: {len(report['events'])}")
+    for event in report["events"]:
+        print(f"  t={event['timestamp']:>10.3f}s  frame={event['frame']:<6} score={event['score']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="PNG directory, .npy/.npz frame stack or video file")
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS,
+                        help="frame rate for sources without timestamps")
+    parser.add_argument("--detector", default=MOTION_DETECTOR,
+                        choices=("frame_diff", "background"))
+    parser.add_argument("--zone-rows", type=int, default=MOTION_ZONE_ROWS)
+    parser.add_argument("--zone-cols", type=int, default=MOTION_ZONE_COLS)
+    parser.add_argument("--zone-thresholds", type=_int_list, default=MOTION_ZONE_THRESHOLDS)
+    parser.add_argument("--ignore-zones", type=_int_list, default=MOTION_IGNORE_ZONES)
+    parser.add_argument("--mask", default=MOTION_MASK_PATH)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    pipeline = MotionPipeline(
+        detector=args.detector,
+        zone_rows=args.zone_rows,
+        zone_cols=args.zone_cols,
+        zone_thresholds=args.zone_thresholds,
+        ignore_zones=args.ignore_zones,
+        mask_path=args.mask,
+        profile=True,
+    )
+    report = replay(open_frame_source(args.path, args.fps), pipeline)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Replay a captured mainboard UART log through the line framer.
+
+    python -m smartmirrord.tools.uart_bench LOG [--repeat 10] [--chunk 1024]
+
+LOG holds raw bytes as read from the serial port. It is fed to LineFramer
+in reader-sized chunks, as UartTransport's reader does, and the report
+gives throughput in MB/s, lines/s and how many times faster than the line
+rate that is. The previous str-based framer runs on the same input for
+comparison.
+"""
+import argparse
+import json
+import time
+
+from smartmirrord.config import UART_BAUDRATE, UART_READ_CHUNK_SIZE, UART_MAX_LINE_BYTES
+from smartmirrord.hardware.uart_framing import LineFramer
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _legacy_framer():
+    """The original decode, += and split("\\n", 1) framing, for comparison."""
+    buffer = ""
+
+    def feed(data: bytes):
+        nonlocal buffer
+        buffer += data.decode("utf-8", errors="ignore")
+        lines = []
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            line = line.strip()
+            if line:
+                lines.append(line)
+        return lines
+
+    return feed
+
+
+def _run(feed, chunks, total_bytes: int, baudrate: int) -> dict:
+    lines = 0
+    started = time.perf_counter()
+    for chunk in chunks:
+        lines += len(feed(chunk))
+    elapsed = time.perf_counter() - started
+
+    # 8N1: ten bit times per byte on the wire.
+    wire_bytes_per_sec = baudrate / 10
+    bytes_per_sec = total_bytes / elapsed if elapsed > 0 else float("inf")
+
+    return {
+        "lines": lines,
+        "elapsed_sec": round(elapsed, 4),
+        "mb_per_sec": round(bytes_per_sec / 1e6, 2),
+        "lines_per_sec": round(lines / elapsed) if elapsed > 0 else 0,
+        "x_line_rate": round(bytes_per_sec / wire_bytes_per_sec, 1),
+    }
+
+
+def bench(data: bytes, chunk_size: int, max_bytes: int, baudrate: int, legacy: bool) -> dict:
+    chunks = _chunks(data, chunk_size)
+
+    framer = LineFramer(max_bytes)
+    report = {
+        "bytes": len(data),
+        "chunk_size": chunk_size,
+        "framer": _run(framer.feed, chunks, len(data), baudrate),
+    }
+    report["framer"].update(overflows=framer.overflows, overflow_bytes=framer.overflow_bytes)
+
+    if legacy:
+        report["legacy"] = _run(_legacy_framer(), chunks, len(data), baudrate)
+
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"Input: {report['bytes']} bytes in {report['chunk_size']}-byte chunks")
+    for name in ("framer", "legacy"):
+        result = report.get(name)
+        if result is None:
+            continue
+        print(
+            f"  {name:<7} {result['mb_per_sec']:>8} MB/s  {result['lines_per_sec']:>9} lines/s  "
+            f"{result['x_line_rate']:>8}x line rate  ({result['lines']} lines, {result['elapsed_sec']}s)"
+        )
+    if report["framer"]["overflows"]:
+        print(
+            f"  overflows: {report['framer']['overflows']} "
+            f"({report['framer']['overflow_bytes']} bytes dropped)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("log", help="raw bytes captured from the mainboard UART")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the log this many times")
+    parser.add_argument("--chunk", type=int, default=UART_READ_CHUNK_SIZE,
+                        help="bytes per simulated read")
+    parser.add_argument("--max-line-bytes", type=int, default=UART_MAX_LINE_BYTES)
+    parser.add_argument("--baudrate", type=int, default=UART_BAUDRATE)
+    parser.add_argument("--no-legacy", action="store_true",
+                        help="skip the old str-based framer")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    with open(args.log, "rb") as f:
+        data = f.read() * args.repeat
+
+    report = bench(data, args.chunk, args.max_line_bytes, args.baudrate, not args.no_legacy)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Decode a UART recording and optionally replay it into the dispatcher.
+
+    python -m smartmirrord.tools.uart_replay DUMP [--replay] [--speed 1.0]
+
+DUMP is a file written by SIGUSR1 or POST /uart/dump. Without --replay the
+records are printed with wall-clock times. With --replay the RX lines are fed
+through a UartDispatcher with VideoMuteService registered, optionally at
+recorded pace, and the resulting panel state and dispatch counters are
+printed, which reproduces how the daemon saw the traffic.
+"""
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+
+from smartmirrord.hardware.uart_recorder import RX, RX_DROPPED, read_recording
+from smartmirrord.services.uart_dispatcher import UartDispatcher
+from smartmirrord.services.videomute_service import VideoMuteService
+
+
+class _ReplayTransport:
+    def __init__(self):
+        self._listeners = []
+
+    def register_listener(self, callback) -> None:
+        self._listeners.append(callback)
+
+    def emit(self, line: str) -> None:
+        for listener in self._listeners:
+            listener(line)
+
+
+class _ReplayPower:
+    def register_on_power_on(self, callback):
+        pass
+
+    def register_on_power_off(self, callback):
+        pass
+
+
+def print_records(path: str) -> None:
+    wall_offset, records = read_recording(path)
+    for timestamp, direction, data, truncated in records:
+        wall = datetime.fromtimestamp(timestamp + wall_offset).strftime("%H:%M:%S.%f")[:-3]
+        arrow = "->" if direction not in (RX, RX_DROPPED) else "<-"
+        suffix = " [truncated]" if truncated else ""
+        if direction == RX_DROPPED:
+            suffix += " [dropped: over-long line]"
+        print(f"{wall} {arrow} {data.decode('utf-8', 'replace')}{suffix}")
+
+
+def replay(path: str, speed: float) -> dict:
+    transport = _ReplayTransport()
+    dispatcher = UartDispatcher(transport)
+    # Replay only observes state lines; nothing is ever written back.
+    videomute = VideoMuteService(dispatcher, None, _ReplayPower())
+
+    dispatcher.start()
+    videomute.start()
+    videomute.on_power_on()
+
+    _, records = read_recording(path)
+    first = None
+    started = time.monotonic()
+    for timestamp, direction, data, _ in records:
+        if direction != RX:
+            continue
+
+        if speed > 0:
+            if first is None:
+                first = timestamp
+            ahead = started + (timestamp - first) / speed - time.monotonic()
+            if ahead > 0:
+                time.sleep(ahead)
+
+        # Records hold the raw bytes; clean them up the way LineFramer does.
+        line = data.decode("utf-8", "ignore").strip()
+        if line:
+            transport.emit(line)
+
+    videomute.stop()
+    dispatcher.stop()
+
+    return {
+        "videomute": {"muted": videomute.is_muted()},
+        "dispatch": dispatcher.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dump", help="file written by SIGUSR1 or POST /uart/dump")
+    parser.add_argument("--replay", action="store_true",
+                        help="feed RX lines through UartDispatcher instead of printing")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="replay pace relative to recording (0 = as fast as possible)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.replay:
+        print(json.dumps(replay(args.dump, args.speed), indent=2))
+    else:
+        print_records(args.dump)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
-from flask import Flask, render_template, request, jsonify, current_app
+import queue
+import time
+
+from flask import Flask, render_template, request, jsonify, current_app, url_for
 
 web_remote = Flask(__name__, template_folder='templates', static_folder='static')
 
@@ -15,10 +18,144 @@ def send_command():
     data = request.get_json()
     cmd = data.get("command")
     try:
-        ir_service.send_command(cmd)
+        job = ir_service.submit(cmd)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except (queue.Full, RuntimeError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
+
+    if data.get("async"):
+        return jsonify({
+            "status": "queued",
+            "job_id": job.id,
+            "status_url": url_for("ir_job", job_id=job.id),
+        }), 202
+
+    job.wait()
+    if job.error:
+        return jsonify({"status": "error", "message": str(job.error)}), 500
+    return jsonify({"status": "ok"})
+
+@web_remote.route("/jobs/<job_id>", methods=["GET"])
+def ir_job(job_id):
+    ir_service = current_app.config["IR_SERVICE"]
+    job = ir_service.get_job(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": f"Unknown job: {job_id}"}), 404
+    return jsonify(job.as_dict())
+
+@web_remote.route("/send_sequence", methods=["POST"])
+def send_sequence():
+    ir_service = current_app.config["IR_SERVICE"]
+
+    data = request.get_json()
+    delay_ms = data.get("inter_key_delay_ms")
+    try:
+        if delay_ms is None:
+            delay = None
+        elif isinstance(delay_ms, (int, float)) and not isinstance(delay_ms, bool):
+            delay = delay_ms / 1000.0
+        else:
+            raise ValueError(f"inter_key_delay_ms must be a number, not {delay_ms!r}")
+
+        if data.get("macro"):
+            job = ir_service.submit_macro(data["macro"], delay)
+        else:
+            job = ir_service.submit_sequence(data.get("commands") or [], delay)
     except ValueError as e:
         return jsonify({"status": "error", "message": str(e)}), 400
-    except IOError:
-        return jsonify({"status": "error", "message": "Unknown error"}), 500
+    except (queue.Full, RuntimeError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
 
+    if data.get("async"):
+        return jsonify({
+            "status": "queued",
+            "job_id": job.id,
+            "status_url": url_for("ir_job", job_id=job.id),
+        }), 202
+
+    job.wait()
+    if job.error:
+        return jsonify({"status": "error", "message": str(job.error)}), 500
     return jsonify({"status": "ok"})
+
+@web_remote.route("/macros", methods=["GET"])
+def macros():
+    ir_service = current_app.config["IR_SERVICE"]
+    return jsonify(ir_service.list_macros())
+
+@web_remote.route("/hold", methods=["POST"])
+def hold():
+    ir_service = current_app.config["IR_SERVICE"]
+
+    data = request.get_json()
+    cmd = data.get("command")
+    try:
+        job = ir_service.hold(cmd)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except (queue.Full, RuntimeError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
+
+    return jsonify({
+        "status": "holding",
+        "job_id": job.id,
+        "status_url": url_for("ir_job", job_id=job.id),
+    }), 202
+
+@web_remote.route("/jobs/<job_id>/release", methods=["POST"])
+def release(job_id):
+    ir_service = current_app.config["IR_SERVICE"]
+    job = ir_service.release(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": f"Unknown job: {job_id}"}), 404
+    return jsonify(job.as_dict())
+
+@web_remote.route("/ir/stats", methods=["GET"])
+def ir_stats():
+    ir_service = current_app.config["IR_SERVICE"]
+    return jsonify(ir_service.timing_stats())
+
+@web_remote.route("/motion/zones", methods=["GET"])
+def motion_zones():
+    motion_service = current_app.config["MOTION_SERVICE"]
+    report = motion_service.zone_report()
+    if report is None:
+        return jsonify({
+            "status": "error",
+            "message": "Zone scores are not available with MOTION_PROCESS enabled",
+        }), 409
+    return jsonify(report)
+
+@web_remote.route("/power/history", methods=["GET"])
+def power_history():
+    history = current_app.config["POWER_HISTORY"]
+    end = request.args.get("end", time.time(), type=float)
+    start = request.args.get("start", type=float)
+    if start is None:
+        start = end - request.args.get("days", 7.0, type=float) * 86400
+    limit = request.args.get("limit", 100, type=int)
+
+    summary = history.summary(start, end)
+    summary["transitions"] = history.transitions(start, end, max(limit, 0))
+    return jsonify(summary)
+
+@web_remote.route("/uart/stats", methods=["GET"])
+def uart_stats():
+    uart = current_app.config["UART"]
+    dispatcher = current_app.config["UART_DISPATCHER"]
+    correlator = current_app.config["UART_CORRELATOR"]
+    return jsonify({
+        "framing": uart.stats(),
+        "dispatch": dispatcher.stats(),
+        "acks": correlator.stats(),
+    })
+
+@web_remote.route("/uart/dump", methods=["POST"])
+def uart_dump():
+    uart = current_app.config["UART"]
+    try:
+        path, records = uart.dump_recording()
+    except OSError as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+    return jsonify({"status": "ok", "path": path, "records": records})
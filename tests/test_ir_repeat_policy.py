@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from smartmirrord.hardware.fake_gpio import RecordingLineRequest
+from smartmirrord.hardware.ir_emulator import IREmulator, RepeatPolicy, WAIT_SPIN
+from smartmirrord.hardware.ir_timing import REPEAT_PERIOD
+
+# Writes per full frame: the first level, then one per pulse end.
+FRAME_WRITES = 68
+
+
+def make_emulator(policies):
+    recorder = RecordingLineRequest()
+    emulator = IREmulator(
+        repeats=2,
+        frame_gap_ms=1.0,
+        wait_strategy=WAIT_SPIN,
+        policies=policies,
+        line_request=recorder,
+    )
+    emulator.start()
+    return emulator, recorder
+
+
+def frame_starts(recorder):
+    assert len(recorder.times) % FRAME_WRITES == 0
+    return recorder.times[::FRAME_WRITES]
+
+
+def test_policy_needs_a_frame():
+    with pytest.raises(ValueError):
+        RepeatPolicy(0)
+
+
+def test_unclassed_command_uses_default_burst():
+    emulator, recorder = make_emulator({})
+    emulator.send("volup")
+
+    assert len(frame_starts(recorder)) == 2
+
+
+def test_repeat_frames_follow_the_held_key_period():
+    emulator, recorder = make_emulator({"volume": RepeatPolicy(1, repeat_frames=2)})
+    emulator.send("volup")
+
+    starts = frame_starts(recorder)
+    assert len(starts) == 3
+    first_frame = recorder.values[:FRAME_WRITES]
+    assert recorder.values[FRAME_WRITES:2 * FRAME_WRITES] == first_frame
+    # Never early; a loaded test machine may oversleep a little.
+    for previous, start in zip(starts, starts[1:]):
+        period_us = (start - previous) / 1000.0
+        assert REPEAT_PERIOD - 500 <= period_us <= REPEAT_PERIOD + 20000
+
+
+def test_hold_stops_when_released():
+    emulator, recorder = make_emulator({})
+    released = threading.Event()
+    checks = []
+
+    # Release from the per-repeat check rather than a timer, so the repeat
+    # count does not depend on scheduling.
+    def check():
+        checks.append(True)
+        if len(checks) == 2:
+            released.set()
+        return False
+
+    sent = emulator.hold("volup", released, max_duration=5.0, preempt=check)
+
+    assert sent == 2
+    assert len(frame_starts(recorder)) == 3
+
+
+def test_hold_stops_when_preempted():
+    emulator, recorder = make_emulator({})
+    checks = []
+
+    def preempt():
+        checks.append(True)
+        return len(checks) > 1
+
+    sent = emulator.hold("volup", threading.Event(), max_duration=5.0, preempt=preempt)
+
+    assert sent == 1
+    assert len(frame_starts(recorder)) == 2
@@ -0,0 +1,105 @@
+import time
+
+from smartmirrord.services.power_history import EDGE, STARTUP, PowerHistory
+
+DAY = 86400.0
+
+
+def test_uptime_dropouts_and_mttr(tmp_path):
+    now = time.time()
+    history = PowerHistory(str(tmp_path / "history.bin"), capacity=64)
+    history.record(True, now - 1000, STARTUP)
+    history.record(False, now - 800, EDGE)
+    history.record(True, now - 760, EDGE)
+    history.record(False, now - 500, EDGE)
+    history.record(True, now - 400, EDGE)
+
+    summary = history.summary(now - 1000, now)
+
+    assert summary["observed_sec"] == 1000.0
+    assert summary["uptime_pct"] == 86.0
+    assert summary["dropouts"] == 2
+    assert summary["recoveries"] == 2
+    assert summary["mttr_sec"] == 70.0
+
+
+def test_window_counts_only_events_inside_it(tmp_path):
+    now = time.time()
+    history = PowerHistory(str(tmp_path / "history.bin"), capacity=64)
+    history.record(True, now - 1000, STARTUP)
+    history.record(False, now - 800, EDGE)
+    history.record(True, now - 760, EDGE)
+
+    summary = history.summary(now - 700, now)
+
+    assert summary["dropouts"] == 0
+    assert summary["uptime_pct"] == 100.0
+    assert summary["mttr_sec"] is None
+
+
+def test_downtime_before_startup_is_unobserved(tmp_path):
+    now = time.time()
+    history = PowerHistory(str(tmp_path / "history.bin"), capacity=64)
+    history.record(True, now - 7 * DAY - 100, STARTUP)
+    history.record(False, now - 100, STARTUP)
+
+    summary = history.summary(now - 8 * DAY, now)
+
+    assert summary["observed_sec"] == 100.0
+    assert summary["uptime_pct"] == 0.0
+    assert summary["dropouts"] == 0
+
+
+def test_reloads_from_disk_and_drops_torn_record(tmp_path):
+    path = tmp_path / "history.bin"
+    now = time.time()
+    history = PowerHistory(str(path), capacity=64)
+    history.record(True, now - 100, STARTUP)
+    history.record(False, now - 50, EDGE)
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02")
+
+    reloaded = PowerHistory(str(path), capacity=64)
+
+    assert len(reloaded) == 2
+    assert [t["state"] for t in reloaded.transitions(now - 200, now, 10)] == ["ON", "OFF"]
+    assert reloaded.summary(now - 100, now)["dropouts"] == 1
+
+
+def test_memory_is_capped(tmp_path):
+    now = time.time()
+    history = PowerHistory(str(tmp_path / "history.bin"), capacity=8)
+    for i in range(40):
+        history.record(i % 2 == 0, now - 100 + i, EDGE)
+
+    assert len(history) <= 8
+    assert history.summary(now - 100, now)["dropouts"] > 0
+
+
+def test_checkpoint_keeps_watched_time_observed(tmp_path):
+    path = str(tmp_path / "history.bin")
+    now = time.time()
+    history = PowerHistory(path, capacity=64)
+    history.record(True, now - 7 * DAY, STARTUP)
+    history.checkpoint(now - 120)
+
+    # Restart: the 60 s after the checkpoint were not watched.
+    reloaded = PowerHistory(path, capacity=64)
+    reloaded.record(True, now - 60, STARTUP)
+    summary = reloaded.summary(now - 7 * DAY, now)
+
+    assert summary["observed_sec"] == 7 * DAY - 60
+    assert summary["uptime_pct"] == 100.0
+
+
+def test_window_inside_gap_splits_at_checkpoint(tmp_path):
+    now = time.time()
+    history = PowerHistory(str(tmp_path / "history.bin"), capacity=64)
+    history.record(True, now - 1000, STARTUP)
+    history.checkpoint(now - 600)
+    history.record(True, now - 200, STARTUP)
+
+    summary = history.summary(now - 800, now - 400)
+
+    assert summary["observed_sec"] == 200.0
+    assert summary["uptime_pct"] == 100.0
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from smartmirrord.services.scheduler_service import SchedulerService
+
+
+@pytest.fixture
+def scheduler():
+    service = SchedulerService()
+    service.start()
+    yield service
+    service.stop()
+
+
+class Recorder:
+    """Callback that records when it ran and signals each call."""
+
+    def __init__(self):
+        self.times = []
+        self.event = threading.Event()
+
+    def __call__(self):
+        self.times.append(time.monotonic())
+        self.event.set()
+
+    def wait(self, timeout=1.0) -> bool:
+        fired = self.event.wait(timeout)
+        self.event.clear()
+        return fired
+
+
+def test_call_later_passes_args(scheduler):
+    got = []
+    done = threading.Event()
+    scheduler.call_later(0.01, lambda *args: (got.extend(args), done.set()), "a", 1)
+
+    assert done.wait(1.0)
+    assert got == ["a", 1]
+
+
+def test_cancel_prevents_call(scheduler):
+    recorder = Recorder()
+    call = scheduler.call_later(0.05, recorder)
+    call.cancel()
+
+    assert not recorder.wait(0.2)
+    assert not call.active
+    assert scheduler.stats()["cancelled"] == 1
+
+
+def test_earlier_reschedule_fires_at_new_deadline(scheduler):
+    recorder = Recorder()
+    call = scheduler.call_later(10.0, recorder)
+    call.reschedule(0.02)
+
+    assert recorder.wait(1.0)
+    assert not call.active
+    # The superseded entry is skipped, not run a second time.
+    assert not recorder.wait(0.1)
+    assert len(recorder.times) == 1
+
+
+def test_later_reschedule_delays_call(scheduler):
+    recorder = Recorder()
+    started = time.monotonic()
+    call = scheduler.call_later(0.05, recorder)
+    call.reschedule(0.2)
+
+    assert recorder.wait(1.0)
+    assert recorder.times[0] - started >= 0.2
+    assert len(recorder.times) == 1
+    assert scheduler.stats()["heap_entries"] == 0
+
+
+def test_reschedule_rearms_fired_call(scheduler):
+    recorder = Recorder()
+    call = scheduler.call_later(0.01, recorder)
+    assert recorder.wait(1.0)
+    assert not call.active
+
+    call.reschedule(0.01)
+    assert call.active
+    assert recorder.wait(1.0)
+    assert len(recorder.times) == 2
+    assert scheduler.stats()["fired"] == 2
+
+
+def test_reschedule_rearms_cancelled_call(scheduler):
+    recorder = Recorder()
+    call = scheduler.call_later(0.05, recorder)
+    call.cancel()
+    call.reschedule(0.01)
+
+    assert recorder.wait(1.0)
+    assert len(recorder.times) == 1
@@ -0,0 +1,72 @@
+from smartmirrord.services.uart_dispatcher import UartDispatcher
+
+
+class FakeTransport:
+    def __init__(self):
+        self.listeners = []
+
+    def register_listener(self, callback):
+        self.listeners.append(callback)
+
+    def feed(self, line):
+        for listener in self.listeners:
+            listener(line)
+
+
+class Collector:
+    def __init__(self):
+        self.lines = []
+
+    def handle(self, line):
+        self.lines.append(line)
+
+
+def make_dispatcher():
+    transport = FakeTransport()
+    dispatcher = UartDispatcher(transport)
+    dispatcher.start()
+    return dispatcher, transport
+
+
+def test_exact_and_prefix_routing():
+    dispatcher, transport = make_dispatcher()
+    exact, prefixed = Collector(), Collector()
+    dispatcher.register_handler(exact, lines=["POWER ON"])
+    dispatcher.register_handler(prefixed, prefixes=["VOL"])
+
+    for line in ("POWER ON", "VOL 12", "POWER OFF"):
+        transport.feed(line)
+
+    assert exact.lines == ["POWER ON"]
+    assert prefixed.lines == ["VOL 12"]
+    assert dispatcher.stats()["unmatched"] == 1
+
+
+def test_handlers_of_one_class_keep_separate_stats():
+    dispatcher, transport = make_dispatcher()
+    first, second, named = Collector(), Collector(), Collector()
+    dispatcher.register_handler(first, lines=["A"])
+    dispatcher.register_handler(second, lines=["B"])
+    dispatcher.register_handler(named, lines=["A"], name="audit")
+
+    transport.feed("A")
+    transport.feed("A")
+    transport.feed("B")
+
+    handlers = dispatcher.stats()["handlers"]
+    assert handlers["Collector"]["dispatched"] == 2
+    assert handlers["Collector#2"]["dispatched"] == 1
+    assert handlers["audit"]["dispatched"] == 2
+
+
+def test_registration_after_start_keeps_existing_routes():
+    dispatcher, transport = make_dispatcher()
+    early, late = Collector(), Collector()
+    dispatcher.register_handler(early, prefixes=["MUTE"])
+    transport.feed("MUTE 1")
+
+    dispatcher.register_handler(late, prefixes=["MU"])
+    transport.feed("MUTE 0")
+
+    assert early.lines == ["MUTE 1", "MUTE 0"]
+    assert late.lines == ["MUTE 0"]
@@ -0,0 +1,68 @@
+from smartmirrord.hardware.uart_framing import LineFramer
+
+
+def test_lines_split_across_chunks():
+    framer = LineFramer(max_bytes=64)
+
+    assert framer.feed(b"POWER O") == []
+    assert framer.feed(b"N\r\nVOL 1") == ["POWER ON"]
+    assert framer.feed(b"2\nMUTE\n") == ["VOL 12", "MUTE"]
+    assert len(framer) == 0
+    assert framer.stats()["lines"] == 3
+
+
+def test_blank_lines_are_skipped():
+    framer = LineFramer(max_bytes=64)
+
+    assert framer.feed(b"\n\r\n  \nOK\n\n") == ["OK"]
+
+
+def test_multibyte_character_split_across_chunks():
+    framer = LineFramer(max_bytes=64)
+    data = "temp 21°C\n".encode("utf-8")
+    split = data.index(b"\xb0")
+
+    assert framer.feed(data[:split]) == []
+    assert framer.feed(data[split:]) == ["temp 21°C"]
+
+
+def test_oversized_line_is_dropped_up_to_next_newline():
+    framer = LineFramer(max_bytes=8)
+
+    assert framer.feed(b"0123456789") == []
+    assert framer.feed(b"abcdef") == []
+    assert framer.feed(b"xyz\nOK\n") == ["OK"]
+
+    stats = framer.stats()
+    assert stats["overflows"] == 1
+    assert stats["overflow_bytes"] == len(b"0123456789abcdefxyz\n")
+    assert stats["buffered_bytes"] == 0
+
+
+def test_reset_drops_partial_line():
+    framer = LineFramer(max_bytes=64)
+    framer.feed(b"PART")
+    framer.reset()
+
+    assert framer.feed(b"IAL\n") == ["IAL"]
+
+
+def test_raw_sees_every_line_before_decoding():
+    framer = LineFramer(max_bytes=8)
+    raw = []
+
+    def record(data, dropped):
+        raw.append((data, dropped))
+
+    lines = framer.feed(b"OK\r\n\n\xff\xfeBAD\n0123456789", record)
+    lines += framer.feed(b"ab\nEND\n", record)
+
+    assert lines == ["OK", "BAD", "END"]
+    assert raw == [
+        (b"OK\r", False),
+        (b"", False),
+        (b"\xff\xfeBAD", False),
+        (b"0123456789", True),
+        (b"ab", True),
+        (b"END", False),
+    ]